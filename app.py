@@ -1,3 +1,5 @@
+import os
+from functools import partial
 from flask import Flask, render_template, request
 from calculators.web_calculators import (
     CompoundInterestWebCalculator, 
@@ -7,89 +9,86 @@ from calculators.web_calculators import (
 )
 
 app = Flask(__name__)
+# Chart payloads go through the tojson filter; key order is irrelevant to Chart.js, so skip the sort
+app.json.sort_keys = False
 
-@app.route('/')
-def index():
-    """Renders the homepage."""
-    return render_template('index.html')
-
-@app.route('/compound', methods=['GET', 'POST'])
-def compound():
-    """Handles the Compound Interest Calculator page."""
-    calculator = CompoundInterestWebCalculator()
-    result = None
-    # Initialize form_data with default numeric values for the GET request
-    form_data = calculator.get_default_form_data()
+# Compile every template up front. Outside debug mode Jinja never re-checks them on disk,
+# and under gunicorn --preload the compiled templates are shared by all workers.
+for _template_name in app.jinja_env.list_templates():
+    app.jinja_env.get_template(_template_name)
 
-    if request.method == 'POST':
-        # On POST, process the form data from the request
-        processed_data, form_data_from_post, error = calculator.process_form_data(request.form)
-        
-        # Use the submitted data to repopulate the form
-        form_data = form_data_from_post
-
-        if error:
-            result = error
-        else:
-            # If data is valid, perform the calculation
-            result = calculator.calculate(processed_data)
-            # Update the form_data dict with the correctly typed numeric values from processed_data.
-            # This ensures that when the template formats these values for the results summary,
-            # it receives numbers, not strings, preventing the ValueError.
-            # The original string values for <select> inputs are preserved.
-            if processed_data:
-                form_data.update(processed_data)
-
-    return render_template('compound.html', result=result, form_data=form_data)
+# The calculators hold no per-request state, so one instance of each is shared by all requests
+_COMPOUND_CALC = CompoundInterestWebCalculator()
+_DCA_CALC = DCAOptimizerWebCalculator()
+_CAPITAL_GAINS_CALC = CapitalGainsWebCalculator()
+_OPTIONS_CALC = OptionsStrategyWebCalculator()
 
+# Default form values are constant, so build them once; templates only read them
+_COMPOUND_DEFAULTS = _COMPOUND_CALC.get_default_form_data()
+_DCA_DEFAULTS = _DCA_CALC.get_default_form_data()
+_CAPITAL_GAINS_DEFAULTS = _CAPITAL_GAINS_CALC.get_default_form_data()
+_OPTIONS_DEFAULTS = _OPTIONS_CALC.get_default_form_data()
 
-@app.route('/dca', methods=['GET', 'POST'])
-def dca():
-    """Handles the DCA Strategy Optimizer page."""
-    calculator = DCAOptimizerWebCalculator()
-    result = None
-    form_data = calculator.get_default_form_data()
-
-    if request.method == 'POST':
-        processed_data, form_data, error = calculator.process_form_data(request.form)
-        if error:
-            result = error
-        else:
-            result = calculator.calculate(processed_data)
+# The homepage has no dynamic content, so it is rendered once and then served from memory
+_INDEX_HTML = None
 
-    return render_template('dca.html', result=result, form_data=form_data)
-
-@app.route('/capital_gains', methods=['GET', 'POST'])
-def capital_gains_calc():
-    """Handles the Capital Gains Opportunity Cost Calculator page."""
-    calculator = CapitalGainsWebCalculator()
-    result = None
-    form_data = calculator.get_default_form_data()
-
-    if request.method == 'POST':
-        processed_data, form_data, error = calculator.process_form_data(request.form)
-        if error:
-            result = error
-        else:
-            result = calculator.calculate(processed_data)
-
-    return render_template('capital_gains.html', result=result, form_data=form_data)
-
-@app.route('/options', methods=['GET', 'POST'])
-def options():
-    """Handles the Options Strategy Calculator page."""
-    calculator = OptionsStrategyWebCalculator()
+@app.route('/')
+def index():
+    """Renders the homepage."""
+    global _INDEX_HTML
+    if _INDEX_HTML is None or app.debug: # Re-render in debug mode so template edits show up
+        _INDEX_HTML = render_template('index.html')
+    return _INDEX_HTML
+
+# The error page is static too; caching it keeps failing requests from paying for a full render
+_ERROR_HTML = None
+
+@app.errorhandler(500)
+def internal_error(error):
+    """Renders the generic error page for unexpected calculation failures."""
+    global _ERROR_HTML
+    if _ERROR_HTML is None or app.debug:
+        _ERROR_HTML = render_template('error.html')
+    return _ERROR_HTML, 500
+
+def _handle_calculator(calculator, default_form_data, template):
+    """Handles the GET/POST cycle shared by all calculator pages."""
     result = None
-    form_data = calculator.get_default_form_data()
+    # Initialize form_data with default numeric values for the GET request
+    form_data = default_form_data
 
     if request.method == 'POST':
-        processed_data, form_data, error = calculator.process_form_data(request.form)
-        if error:
-            result = error
-        else:
-            result = calculator.calculate(processed_data)
-
-    return render_template('options.html', result=result, form_data=form_data)
+        # On POST, process the form data from the request, perform the calculation and repopulate the form.
+        # The compound calculator returns its form data updated with the correctly typed numeric values,
+        # so the template formats numbers rather than strings for the results summary.
+        result, form_data = calculator.process_and_calculate(request.form)
+
+    return render_template(template, result=result, form_data=form_data)
+
+# (endpoint, URL, template, calculator, default form data)
+_CALCULATOR_ROUTES = [
+    ('compound', '/compound', 'compound.html', _COMPOUND_CALC, _COMPOUND_DEFAULTS),
+    ('dca', '/dca', 'dca.html', _DCA_CALC, _DCA_DEFAULTS),
+    ('capital_gains_calc', '/capital_gains', 'capital_gains.html', _CAPITAL_GAINS_CALC, _CAPITAL_GAINS_DEFAULTS),
+    ('options', '/options', 'options.html', _OPTIONS_CALC, _OPTIONS_DEFAULTS),
+]
+
+for endpoint, rule, template, calculator, default_form_data in _CALCULATOR_ROUTES:
+    app.add_url_rule(
+        rule, endpoint,
+        partial(_handle_calculator, calculator, default_form_data, template),
+        methods=['GET', 'POST']
+    )
 
 if __name__ == '__main__':
-    app.run(debug=True)
+    if os.environ.get('FINCALC_GUNICORN'):
+        # Replace this process with a multi-worker gunicorn server instead of the single-threaded dev server.
+        # --preload imports the app before forking, so the module-level caches are shared by all workers.
+        workers = os.environ.get('FINCALC_WORKERS', '4')
+        threads = os.environ.get('FINCALC_THREADS', '8')
+        os.execvp('gunicorn', [
+            'gunicorn', '-w', workers, '-k', 'gthread', '--threads', threads,
+            '--preload', '-b', '0.0.0.0:5000', 'wsgi:application'
+        ])
+    # The debugger and reloader slow down every request, so they are opt-in
+    app.run(debug=os.environ.get('FLASK_DEBUG') == '1')
@@ -1,21 +1,26 @@
 # calculators/capital_gains.py
-from decimal import Decimal
+import numpy as np
+
+def _input_error(current_value, cost_basis, tax_rate):
+    """Returns the error for the first invalid input; only called once the combined check has failed."""
+    if current_value <= 0:
+        return {"error": "Current Investment Value must be a positive number."}
+    if cost_basis <= 0:
+        return {"error": "Original Cost Basis must be a positive number."}
+    return {"error": "Capital Gains Tax Rate must be between 0 (0%) and 1 (100%)."}
 
 def calculate_required_return(current_value, cost_basis, tax_rate):
     """
     Calculates the required return on a new investment to justify
     selling a current one and paying capital gains tax.
     """
-    current_value = Decimal(current_value)
-    cost_basis = Decimal(cost_basis)
-    tax_rate = Decimal(tax_rate)
+    # Plain floats are ample for percentage-level results; values are rounded only when displayed
+    current_value = float(current_value)
+    cost_basis = float(cost_basis)
+    tax_rate = float(tax_rate)
 
-    if current_value <= 0:
-        return {"error": "Current Investment Value must be a positive number."}
-    if cost_basis <= 0:
-        return {"error": "Original Cost Basis must be a positive number."}
-    if not (Decimal('0') <= tax_rate < Decimal('1')):
-        return {"error": "Capital Gains Tax Rate must be between 0 (0%) and 1 (100%)."}
+    if not (current_value > 0 and cost_basis > 0 and 0 <= tax_rate < 1):
+        return _input_error(current_value, cost_basis, tax_rate)
 
     if current_value < cost_basis:
         return {
@@ -37,30 +42,26 @@ def calculate_required_return(current_value, cost_basis, tax_rate):
         "required_return": required_return
     }
 
-def generate_tax_rate_chart_data(current_value, cost_basis, max_tax_rate=Decimal('0.40')):
+def generate_tax_rate_chart_data(current_value, cost_basis, max_tax_rate=0.40):
     """
     Generates data for a chart showing required return vs. tax rate.
     """
     if current_value <= 0 or cost_basis <= 0 or current_value < cost_basis:
         return None # Cannot generate meaningful chart data
 
-    tax_rates = [Decimal(i) / Decimal('100') for i in range(0, int(max_tax_rate * 100) + 1, 2)] # From 0% to max_tax_rate, in 2% increments
-    required_returns = []
-
-    for rate in tax_rates:
-        result = calculate_required_return(current_value, cost_basis, rate)
-        if "error" not in result and "note" not in result:
-            required_returns.append(result['required_return'])
-        else:
-            required_returns.append(Decimal('0')) # Or None, depending on desired chart behavior
+    # From 0% to max_tax_rate, in 2% increments, evaluated for all rates at once.
+    # The guard above ensures 0 <= capital gain < current value, so post-tax proceeds stay positive.
+    tax_percents = np.arange(0, round(max_tax_rate * 100) + 1, 2)
+    capital_gain = float(current_value - cost_basis)
+    tax_costs = tax_percents / 100 * capital_gain
+    required_returns = tax_costs / (float(current_value) - tax_costs)
 
-    # Convert Decimals to floats for Chart.js
     chart_data = {
-        'labels': [f"{float(r*100):.0f}%" for r in tax_rates],
+        'labels': [f"{p}%" for p in tax_percents.tolist()],
         'datasets': [
             {
                 'label': 'Required Return',
-                'data': [float(rr) for rr in required_returns],
+                'data': required_returns.tolist(),
                 'borderColor': 'rgba(79, 70, 229, 1)', # Indigo
                 'backgroundColor': 'rgba(79, 70, 229, 0.2)',
                 'fill': True,
@@ -1,237 +1,304 @@
 # calculators/compound_interest.py (Updated for multi-goal calculations)
 
-from decimal import Decimal, getcontext
+from functools import lru_cache
 import math
+from types import MappingProxyType
+import numpy as np
+# Imported at module level so gunicorn --preload loads scipy once in the master, not in every worker
+from scipy.optimize import brentq
 
-# Set precision for Decimal calculations
-getcontext().prec = 10
+@lru_cache(maxsize=1024)
+def _growth_and_annuity_factor(rate_per_period, num_periods, deposit_at_beginning):
+    """
+    Returns ((1 + r)^n, annuity factor) as floats for a rate per period and number of periods.
+    The annuity factor is the future value of a deposit of 1 per period, so the
+    future value, required deposit and required initial balance share the same algebra.
+    """
+    # n * ln(1 + r) gives (1 + r)^n via exp, and (1 + r)^n - 1 via expm1 without cancellation for small r
+    log_growth = num_periods * math.log1p(rate_per_period)
+    growth = math.exp(log_growth)
+    if rate_per_period > 0:
+        annuity_factor = math.expm1(log_growth) / rate_per_period
+        if deposit_at_beginning:
+            annuity_factor *= 1 + rate_per_period
+    else:
+        # If no interest, it's just the number of deposits
+        annuity_factor = num_periods
+    return growth, annuity_factor
 
 def calculate_future_value(principal, annual_rate, years, periods_per_year, periodic_deposit, deposit_at_beginning):
     """
     Calculates the future value of an investment with periodic deposits.
-    All inputs are expected to be Decimal for precision.
+    Inputs may be Decimal or plain numbers; the arithmetic is done in float, which is
+    far faster than Decimal and more than precise enough for currency amounts.
     """
-    principal = Decimal(principal)
-    annual_rate = Decimal(annual_rate)
-    periodic_deposit = Decimal(periodic_deposit)
-    years_dec = Decimal(years) # Use Decimal for years in FV calculation for consistency
-    periods_per_year_dec = Decimal(periods_per_year)
+    principal = float(principal)
+    annual_rate = float(annual_rate)
+    periodic_deposit = float(periodic_deposit)
+    years = float(years)
+    periods_per_year = float(periods_per_year)
 
-    if periods_per_year_dec == 0:
-        # Simple sum if no compounding periods
-        return principal + (periodic_deposit * years_dec * periods_per_year_dec) # Should be 0 if periods_per_year_dec is 0
+    if periods_per_year == 0:
+        # No compounding periods, so nothing is deposited or earned
+        return principal
 
-    rate_per_period = (annual_rate / Decimal('100')) / periods_per_year_dec
-    num_periods = years_dec * periods_per_year_dec
+    rate_per_period = (annual_rate / 100) / periods_per_year
+    num_periods = years * periods_per_year
+
+    growth, annuity_factor = _growth_and_annuity_factor(rate_per_period, num_periods, deposit_at_beginning)
 
     # Future value of initial principal
-    fv_principal = principal * ((Decimal('1') + rate_per_period) ** num_periods)
+    fv_principal = principal * growth
 
     # Future value of periodic deposits (annuity)
+    fv_deposits = periodic_deposit * annuity_factor
+
+    return fv_principal + fv_deposits
+
+def _future_value_components_vec(principal, annual_rate, years, periods_per_year, periodic_deposit, deposit_at_beginning):
+    """
+    Returns the future value of the initial principal and of the deposits as separate ndarrays.
+    Every argument may be a scalar or a NumPy array; they are broadcast against each other.
+    """
+    principal = np.asarray(principal, dtype=np.float64)
+    periodic_deposit = np.asarray(periodic_deposit, dtype=np.float64)
+    periods_per_year = np.asarray(periods_per_year, dtype=np.float64)
+
+    rate_per_period = (np.asarray(annual_rate, dtype=np.float64) / 100) / periods_per_year
+    num_periods = np.asarray(years, dtype=np.float64) * periods_per_year
+
+    # (1 + r)^n and (1 + r)^n - 1 via log1p/expm1, which stay accurate at small rates
+    log_growth = num_periods * np.log1p(rate_per_period)
+    fv_principal = principal * np.exp(log_growth)
+
+    # With no interest the deposits simply add up; the (1 + r) timing factor only applies when r > 0
+    has_interest = rate_per_period > 0
+    safe_rate = np.where(has_interest, rate_per_period, 1.0) # Avoids dividing by zero in the unused branch
+    annuity_factor = np.where(has_interest, np.expm1(log_growth) / safe_rate, num_periods)
+    annuity_factor = annuity_factor * np.where(has_interest & np.asarray(deposit_at_beginning, dtype=bool), 1.0 + rate_per_period, 1.0)
+    fv_deposits = periodic_deposit * annuity_factor
+
+    return fv_principal, fv_deposits
+
+def calculate_future_value_vec(principal, annual_rate, years, periods_per_year, periodic_deposit, deposit_at_beginning):
+    """
+    Vectorized float counterpart of calculate_future_value, e.g. for a grid of rates and durations.
+    Every argument may be a scalar or a NumPy array; the broadcast balances are returned as an ndarray.
+    """
+    fv_principal, fv_deposits = _future_value_components_vec(principal, annual_rate, years, periods_per_year, periodic_deposit, deposit_at_beginning)
+    return fv_principal + fv_deposits
+
+def _log_future_value(principal, annual_rate, years, periods_per_year, periodic_deposit, deposit_at_beginning):
+    """
+    Natural log of the future value, computed without forming (1 + r)^n so it stays finite at very high rates.
+    All inputs are expected to be float.
+    """
+    rate_per_period = (annual_rate / 100) / periods_per_year
+    num_periods = years * periods_per_year
+
     if rate_per_period > 0:
-        fv_deposits = periodic_deposit * (((Decimal('1') + rate_per_period) ** num_periods - Decimal('1')) / rate_per_period)
-        if deposit_at_beginning:
-            fv_deposits *= (Decimal('1') + rate_per_period)
+        log_growth = num_periods * math.log1p(rate_per_period)
+        deposit_term = periodic_deposit * ((1 + rate_per_period) if deposit_at_beginning else 1) / rate_per_period
+        # FV = (1 + r)^n * (P + D/r * (1 - (1 + r)^-n))
+        scaled_balance = principal - deposit_term * math.expm1(-log_growth)
     else:
-        # If no interest, it's just the sum of deposits
-        fv_deposits = periodic_deposit * num_periods
-        
-    return fv_principal + fv_deposits
+        log_growth = 0.0
+        scaled_balance = principal + periodic_deposit * num_periods
+
+    return log_growth + math.log(scaled_balance) if scaled_balance > 0 else -math.inf
 
 def _generate_compound_history(principal, annual_rate, years, periods_per_year, periodic_deposit, deposit_at_beginning):
     """
-    Generates data for a chart in a Chart.js-friendly format, given all parameters.
-    All inputs are expected to be Decimal.
+    Generates the year-by-year history used for the chart, given all parameters.
+    All years are evaluated in a single vectorized pass and each field is returned as its own NumPy array.
     """
-    history = []
-    
-    # Initialize values for the first year (year 0)
-    current_principal_component = principal
-    current_total_deposits_component = Decimal('0')
-    current_interest_earned_component = Decimal('0')
-    
-    history.append({
-        'year': 0,
-        'balance': principal,
-        'principal_component': current_principal_component,
-        'total_deposits_component': current_total_deposits_component,
-        'interest_earned_component': current_interest_earned_component
-    })
-
-    for year in range(1, int(years) + 1):
-        # Calculate balance for the current year
-        balance = calculate_future_value(principal, annual_rate, Decimal(year), periods_per_year, periodic_deposit, deposit_at_beginning)
-        
-        # Total deposits made over time
-        total_deposits_component_current_year = periodic_deposit * Decimal(periods_per_year) * Decimal(year)
-
-        # Interest is the total balance minus initial principal and total deposits
-        interest_earned_component_current_year = balance - principal - total_deposits_component_current_year
-
-        history.append({
-            'year': year,
-            'balance': balance,
-            'principal_component': principal, # Initial principal remains constant
-            'total_deposits_component': total_deposits_component_current_year,
-            'interest_earned_component': interest_earned_component_current_year
-        })
-    
-    return history
+    principal = float(principal)
+    years_arr = np.arange(int(years) + 1)
+
+    with np.errstate(over='ignore', invalid='ignore'):
+        fv_principal, fv_deposits = _future_value_components_vec(principal, annual_rate, years_arr, periods_per_year, periodic_deposit, deposit_at_beginning)
+    balance = fv_principal + fv_deposits
+    # NumPy overflows to inf instead of raising; fail the way the scalar math.exp path does, so callers
+    # report a calculation error rather than rendering "inf" and emitting Infinity in the chart JSON
+    if not np.isfinite(balance).all():
+        raise OverflowError("math range error")
+
+    # Total deposits made over time
+    total_deposits = float(periodic_deposit) * float(periods_per_year) * years_arr
+
+    return {
+        'year': years_arr,
+        'balance': balance,
+        'principal_component': np.full(years_arr.shape, principal), # Initial principal remains constant
+        'total_deposits_component': total_deposits,
+        # Interest is the growth of each component, taken separately rather than as a difference of totals
+        'interest_earned_component': (fv_principal - principal) + (fv_deposits - total_deposits)
+    }
+
+_GOAL_INPUT_ERROR = "All numeric inputs must be positive or zero (except for frequency, which must be positive). Goal balance must be positive."
+# One message per validated value, in the order they are passed to _input_error (non-negative values first)
+_FINAL_BALANCE_INPUT_ERRORS = (
+    "Initial Balance must be zero or positive.",
+    "Periodic Deposit must be zero or positive.",
+    "Annual Interest Rate must be zero or positive.",
+    "Duration (Years) must be a positive integer.",
+    "Deposit Frequency must be at least once a year."
+)
+
+def _input_error(non_negative, positive, message=_GOAL_INPUT_ERROR):
+    """
+    Validates the inputs shared by all the compound interest calculations.
+    Returns the error dictionary, or None if every `non_negative` value is >= 0 and every `positive` value is > 0.
+    `message` is either one message for any failure, or a sequence with one message per value
+    (`non_negative` values first), in which case the first failing value's message is reported.
+    """
+    if all(value >= 0 for value in non_negative) and all(value > 0 for value in positive):
+        return None
+    if isinstance(message, str):
+        return {"error": message}
+    passed = [value >= 0 for value in non_negative] + [value > 0 for value in positive]
+    return {"error": next(text for ok, text in zip(passed, message) if not ok)}
+
+# Chart.js styling for each history component, keyed by the history field it plots.
+# Built once and read-only; _build_chart_data copies each one and adds the data.
+_CHART_DATASET_STYLES = (
+    ('principal_component', MappingProxyType({
+        'label': 'Initial Principal',
+        'backgroundColor': 'rgba(59, 130, 246, 0.7)', # Blue
+        'borderColor': 'rgba(59, 130, 246, 1)',
+        'borderWidth': 1
+    })),
+    ('total_deposits_component', MappingProxyType({
+        'label': 'Total Deposits',
+        'backgroundColor': 'rgba(16, 185, 129, 0.7)', # Green
+        'borderColor': 'rgba(16, 185, 129, 1)',
+        'borderWidth': 1
+    })),
+    ('interest_earned_component', MappingProxyType({
+        'label': 'Interest Earned',
+        'backgroundColor': 'rgba(245, 158, 11, 0.7)', # Amber
+        'borderColor': 'rgba(245, 158, 11, 1)',
+        'borderWidth': 1
+    })),
+)
+
+def _build_chart_data(history):
+    """
+    Converts the history arrays into a Chart.js-friendly stacked bar format.
+    """
+    return {
+        'labels': history['year'].tolist(),
+        'datasets': [{**style, 'data': history[field].tolist()} for field, style in _CHART_DATASET_STYLES]
+    }
 
 def calculate_final_balance_and_history(principal, annual_rate, years, periods_per_year, periodic_deposit, deposit_at_beginning):
     """
     Calculates final balance and generates data for a chart.
+    Inputs may be Decimal or plain numbers; the arithmetic is done in float.
     """
-    principal = Decimal(principal)
-    periodic_deposit = Decimal(periodic_deposit)
-    annual_rate = Decimal(annual_rate)
+    principal = float(principal)
+    periodic_deposit = float(periodic_deposit)
+    annual_rate = float(annual_rate)
 
-    if principal < 0: return {"error": "Initial Balance must be zero or positive."}
-    if periodic_deposit < 0: return {"error": "Periodic Deposit must be zero or positive."}
-    if annual_rate < 0: return {"error": "Annual Interest Rate must be zero or positive."}
-    if years <= 0: return {"error": "Duration (Years) must be a positive integer."}
-    if periods_per_year <= 0: return {"error": "Deposit Frequency must be at least once a year."}
+    error = _input_error(non_negative=(principal, periodic_deposit, annual_rate), positive=(years, periods_per_year), message=_FINAL_BALANCE_INPUT_ERRORS)
+    if error:
+        return error
 
     history = _generate_compound_history(principal, annual_rate, years, periods_per_year, periodic_deposit, deposit_at_beginning)
-    final_result = history[-1]
     
-    # Prepare data in a Chart.js-friendly format
-    chart_data = {
-        'labels': [h['year'] for h in history],
-        'datasets': [
-            {
-                'label': 'Initial Principal',
-                'data': [float(h['principal_component']) for h in history],
-                'backgroundColor': 'rgba(59, 130, 246, 0.7)', # Blue
-                'borderColor': 'rgba(59, 130, 246, 1)',
-                'borderWidth': 1
-            },
-            {
-                'label': 'Total Deposits',
-                'data': [float(h['total_deposits_component']) for h in history],
-                'backgroundColor': 'rgba(16, 185, 129, 0.7)', # Green
-                'borderColor': 'rgba(16, 185, 129, 1)',
-                'borderWidth': 1
-            },
-            {
-                'label': 'Interest Earned',
-                'data': [float(h['interest_earned_component']) for h in history],
-                'backgroundColor': 'rgba(245, 158, 11, 0.7)', # Amber
-                'borderColor': 'rgba(245, 158, 11, 1)',
-                'borderWidth': 1
-            }
-        ]
-    }
+    chart_data = _build_chart_data(history)
 
     return {
-        "final_balance": final_result['balance'],
+        "final_balance": float(history['balance'][-1]),
         "principal": principal,
-        "total_deposits": final_result['total_deposits_component'],
-        "interest_earned": final_result['interest_earned_component'],
+        "total_deposits": float(history['total_deposits_component'][-1]),
+        "interest_earned": float(history['interest_earned_component'][-1]),
         "chart_data": chart_data,
         "calculated_field": "final_balance"
     }
 
 
-def calculate_time_to_reach_goal(principal, annual_rate, periodic_deposit, periods_per_year, deposit_at_beginning, goal_balance):
+def calculate_time_to_reach_goal(principal, annual_rate, periodic_deposit, periods_per_year, deposit_at_beginning, goal_balance, generate_chart=True):
     """
-    Calculates the years needed to reach a goal balance using binary search.
-    All inputs are expected to be Decimal.
+    Calculates the years needed to reach a goal balance by inverting the future value formula.
+    Inputs may be Decimal or plain numbers; the arithmetic is done in float.
+    With generate_chart=False the chart history is skipped and chart_data is None.
     """
-    principal = Decimal(principal)
-    annual_rate = Decimal(annual_rate)
-    periodic_deposit = Decimal(periodic_deposit)
-    periods_per_year = Decimal(periods_per_year)
-    goal_balance = Decimal(goal_balance)
-
-    if principal < 0 or periodic_deposit < 0 or annual_rate < 0 or periods_per_year <= 0 or goal_balance <= 0:
-        return {"error": "All numeric inputs must be positive or zero (except for frequency, which must be positive). Goal balance must be positive."}
+    principal = float(principal)
+    annual_rate = float(annual_rate)
+    periodic_deposit = float(periodic_deposit)
+    periods_per_year = float(periods_per_year)
+    goal_balance = float(goal_balance)
+
+    error = _input_error(non_negative=(principal, periodic_deposit, annual_rate), positive=(periods_per_year, goal_balance))
+    if error:
+        return error
     if goal_balance <= principal and periodic_deposit == 0:
         return {"note": "Your initial balance already meets or exceeds your goal, or you have no deposits to grow it."}
 
-    low_years = Decimal('0')
-    high_years = Decimal('200') # Max 200 years to prevent infinite loop
+    max_years = 200 # Max 200 years to keep the goal realistic
 
     # Check if goal is reachable at all with initial capital and no deposits/interest if applicable
     if annual_rate == 0 and periodic_deposit == 0:
         if principal >= goal_balance:
-            return {"years": low_years, "calculated_field": "years", "chart_data": None} # Goal already met
+            return {"years": 0.0, "calculated_field": "years", "chart_data": None} # Goal already met
         else:
             return {"error": "With zero interest and zero periodic deposits, goal is unreachable without more capital."}
 
-    # Binary search for years
-    for _ in range(100): # 100 iterations for precision
-        mid_years = (low_years + high_years) / Decimal('2')
-        if mid_years == low_years or mid_years == high_years: # Prevent infinite loop if values converge too slowly
-            break
-        
-        fv = calculate_future_value(principal, annual_rate, mid_years, periods_per_year, periodic_deposit, deposit_at_beginning)
-        
-        if fv < goal_balance:
-            low_years = mid_years
-        else:
-            high_years = mid_years
-            
-    final_years = high_years # High_years will be the first value to exceed goal
+    unreachable_error = {"error": f"Goal of €{goal_balance:,.2f} unreachable within {int(max_years)} years with given inputs. Consider increasing deposit/initial balance/interest rate."}
+
+    # Solve the future value formula for the number of periods:
+    # goal = (P + D/r) * (1 + r)^n - D/r, where D includes the (1 + r) factor for deposits at the beginning
+    rate_per_period = (annual_rate / 100) / periods_per_year
+    if rate_per_period > 0:
+        deposit_term = periodic_deposit * ((1 + rate_per_period) if deposit_at_beginning else 1) / rate_per_period
+        if principal + deposit_term <= 0: # Nothing to compound
+            return unreachable_error
+        num_periods = math.log((goal_balance + deposit_term) / (principal + deposit_term)) / math.log1p(rate_per_period)
+    else:
+        # If no interest, the goal is reached by deposits alone
+        num_periods = (goal_balance - principal) / periodic_deposit
+
+    final_years = max(num_periods, 0.0) / periods_per_year
     
-    if final_years > Decimal('199'): # If it hits max years, it might be unreachable
-        return {"error": f"Goal of €{goal_balance:,.2f} unreachable within {int(high_years)} years with given inputs. Consider increasing deposit/initial balance/interest rate."}
+    if final_years > max_years - 1: # Beyond the horizon, treat as unreachable
+        return unreachable_error
 
     # Generate history for the chart based on the calculated years
-    history = _generate_compound_history(principal, annual_rate, final_years, periods_per_year, periodic_deposit, deposit_at_beginning)
-    
-    chart_data = {
-        'labels': [h['year'] for h in history],
-        'datasets': [
-            {
-                'label': 'Initial Principal',
-                'data': [float(h['principal_component']) for h in history],
-                'backgroundColor': 'rgba(59, 130, 246, 0.7)', # Blue
-                'borderColor': 'rgba(59, 130, 246, 1)',
-                'borderWidth': 1
-            },
-            {
-                'label': 'Total Deposits',
-                'data': [float(h['total_deposits_component']) for h in history],
-                'backgroundColor': 'rgba(16, 185, 129, 0.7)', # Green
-                'borderColor': 'rgba(16, 185, 129, 1)',
-                'borderWidth': 1
-            },
-            {
-                'label': 'Interest Earned',
-                'data': [float(h['interest_earned_component']) for h in history],
-                'backgroundColor': 'rgba(245, 158, 11, 0.7)', # Amber
-                'borderColor': 'rgba(245, 158, 11, 1)',
-                'borderWidth': 1
-            }
-        ]
-    }
+    chart_data = None
+    if generate_chart: # Callers that only need the calculated value can skip the history
+        history = _generate_compound_history(principal, annual_rate, final_years, periods_per_year, periodic_deposit, deposit_at_beginning)
+        chart_data = _build_chart_data(history)
 
     return {
         "years": final_years,
-        "final_balance": calculate_future_value(principal, annual_rate, final_years, periods_per_year, periodic_deposit, deposit_at_beginning),
+        # The solved time reaches the goal exactly, unless the goal was already met at the start
+        "final_balance": goal_balance if final_years > 0 else principal,
         "chart_data": chart_data,
         "calculated_field": "years"
     }
 
-def calculate_periodic_deposit_needed(principal, annual_rate, years, periods_per_year, deposit_at_beginning, goal_balance):
+def calculate_periodic_deposit_needed(principal, annual_rate, years, periods_per_year, deposit_at_beginning, goal_balance, generate_chart=True):
     """
     Calculates the periodic deposit needed to reach a goal balance.
-    All inputs are expected to be Decimal.
+    Inputs may be Decimal or plain numbers; the arithmetic is done in float.
+    With generate_chart=False the chart history is skipped and chart_data is None.
     """
-    principal = Decimal(principal)
-    annual_rate = Decimal(annual_rate)
-    years_dec = Decimal(years)
-    periods_per_year_dec = Decimal(periods_per_year)
-    goal_balance = Decimal(goal_balance)
+    principal = float(principal)
+    annual_rate = float(annual_rate)
+    years_f = float(years)
+    periods_per_year_f = float(periods_per_year)
+    goal_balance = float(goal_balance)
 
-    if principal < 0 or annual_rate < 0 or years_dec <= 0 or periods_per_year_dec <= 0 or goal_balance <= 0:
-        return {"error": "All numeric inputs must be positive or zero (except for frequency, which must be positive). Goal balance must be positive."}
+    error = _input_error(non_negative=(principal, annual_rate), positive=(years_f, periods_per_year_f, goal_balance))
+    if error:
+        return error
 
     # Calculate FV of initial principal
-    rate_per_period = (annual_rate / Decimal('100')) / periods_per_year_dec
-    num_periods = years_dec * periods_per_year_dec
-    fv_principal_only = principal * ((Decimal('1') + rate_per_period) ** num_periods)
+    rate_per_period = (annual_rate / 100) / periods_per_year_f
+    num_periods = years_f * periods_per_year_f
+    growth, annuity_factor = _growth_and_annuity_factor(rate_per_period, num_periods, deposit_at_beginning)
+    fv_principal_only = principal * growth
 
     if fv_principal_only >= goal_balance:
         return {"note": f"Your initial principal (€{principal:,.2f}) already grows to €{fv_principal_only:,.2f}, which meets or exceeds your goal of €{goal_balance:,.2f} without any periodic deposits. Required deposit is €0.00."}
@@ -240,17 +307,10 @@ def calculate_periodic_deposit_needed(principal, annual_rate, years, periods_per
     required_fv_from_deposits = goal_balance - fv_principal_only
 
     # Calculate PMT (periodic deposit)
-    if rate_per_period > 0:
-        denominator = ((Decimal('1') + rate_per_period) ** num_periods - Decimal('1')) / rate_per_period
-        if deposit_at_beginning:
-            denominator *= (Decimal('1') + rate_per_period)
-        
-        if denominator == 0: # Should not happen if rate_per_period > 0 and num_periods > 0
-            return {"error": "Cannot calculate required periodic deposit due to mathematical impossibility (denominator is zero)."}
-        
-        required_deposit = required_fv_from_deposits / denominator
-    else: # rate_per_period == 0
-        required_deposit = required_fv_from_deposits / num_periods
+    if annuity_factor == 0: # Should not happen if num_periods > 0
+        return {"error": "Cannot calculate required periodic deposit due to mathematical impossibility (denominator is zero)."}
+
+    required_deposit = required_fv_from_deposits / annuity_factor
     
     if required_deposit < 0:
         # This can happen if goal_balance is less than fv_principal_only, 
@@ -258,144 +318,89 @@ def calculate_periodic_deposit_needed(principal, annual_rate, years, periods_per
         return {"note": f"Your initial principal already grows to €{fv_principal_only:,.2f}, which exceeds your goal of €{goal_balance:,.2f}. No periodic deposit is needed."}
         
     # Generate history for the chart based on the calculated periodic deposit
-    history = _generate_compound_history(principal, annual_rate, years, periods_per_year, required_deposit, deposit_at_beginning)
-
-    chart_data = {
-        'labels': [h['year'] for h in history],
-        'datasets': [
-            {
-                'label': 'Initial Principal',
-                'data': [float(h['principal_component']) for h in history],
-                'backgroundColor': 'rgba(59, 130, 246, 0.7)', # Blue
-                'borderColor': 'rgba(59, 130, 246, 1)',
-                'borderWidth': 1
-            },
-            {
-                'label': 'Total Deposits',
-                'data': [float(h['total_deposits_component']) for h in history],
-                'backgroundColor': 'rgba(16, 185, 129, 0.7)', # Green
-                'borderColor': 'rgba(16, 185, 129, 1)',
-                'borderWidth': 1
-            },
-            {
-                'label': 'Interest Earned',
-                'data': [float(h['interest_earned_component']) for h in history],
-                'backgroundColor': 'rgba(245, 158, 11, 0.7)', # Amber
-                'borderColor': 'rgba(245, 158, 11, 1)',
-                'borderWidth': 1
-            }
-        ]
-    }
+    chart_data = None
+    if generate_chart:
+        history = _generate_compound_history(principal, annual_rate, years, periods_per_year, required_deposit, deposit_at_beginning)
+        chart_data = _build_chart_data(history)
     
     return {
         "periodic_deposit": required_deposit,
-        "final_balance": calculate_future_value(principal, annual_rate, years, periods_per_year, required_deposit, deposit_at_beginning),
+        "final_balance": goal_balance, # The solved value reaches the goal exactly, by construction
         "chart_data": chart_data,
         "calculated_field": "periodic_deposit"
     }
 
-def calculate_interest_rate_needed(principal, years, periods_per_year, periodic_deposit, deposit_at_beginning, goal_balance):
+def calculate_interest_rate_needed(principal, years, periods_per_year, periodic_deposit, deposit_at_beginning, goal_balance, generate_chart=True):
     """
-    Calculates the annual interest rate needed to reach a goal balance using binary search.
-    All inputs are expected to be Decimal.
+    Calculates the annual interest rate needed to reach a goal balance using Brent's method.
+    Inputs may be Decimal or plain numbers; the arithmetic is done in float.
+    With generate_chart=False the chart history is skipped and chart_data is None.
     """
-    principal = Decimal(principal)
-    years_dec = Decimal(years)
-    periodic_deposit = Decimal(periodic_deposit)
-    periods_per_year_dec = Decimal(periods_per_year)
-    goal_balance = Decimal(goal_balance)
-
-    if principal < 0 or periodic_deposit < 0 or years_dec <= 0 or periods_per_year_dec <= 0 or goal_balance <= 0:
-        return {"error": "All numeric inputs must be positive or zero (except for frequency, which must be positive). Goal balance must be positive."}
+    principal = float(principal)
+    years_f = float(years)
+    periodic_deposit = float(periodic_deposit)
+    periods_per_year_f = float(periods_per_year)
+    goal_balance = float(goal_balance)
+
+    error = _input_error(non_negative=(principal, periodic_deposit), positive=(years_f, periods_per_year_f, goal_balance))
+    if error:
+        return error
     
     # Edge case: If goal is already met or impossible without interest
-    fv_at_zero_rate = calculate_future_value(principal, Decimal('0'), years_dec, periods_per_year_dec, periodic_deposit, deposit_at_beginning)
+    fv_at_zero_rate = calculate_future_value(principal, 0.0, years_f, periods_per_year_f, periodic_deposit, deposit_at_beginning)
     if fv_at_zero_rate >= goal_balance:
         return {"note": f"Your investment reaches €{fv_at_zero_rate:,.2f} with 0% interest, already meeting or exceeding your goal of €{goal_balance:,.2f}. Required interest rate is 0.00%."}
 
-    low_rate = Decimal('0')
-    high_rate = Decimal('1000') # Search up to 1000% annual rate
+    max_rate = 1000.0 # Search up to 1000% annual rate
+    log_goal = math.log(goal_balance)
 
-    # Binary search for annual_rate
-    for _ in range(100): # 100 iterations for precision
-        mid_rate = (low_rate + high_rate) / Decimal('2')
-        if mid_rate == low_rate or mid_rate == high_rate: # Prevent infinite loop if values converge too slowly
-            break
+    def log_shortfall(rate):
+        return _log_future_value(principal, rate, years_f, periods_per_year_f, periodic_deposit, deposit_at_beginning) - log_goal
 
-        fv = calculate_future_value(principal, mid_rate, years_dec, periods_per_year_dec, periodic_deposit, deposit_at_beginning)
+    if log_shortfall(max_rate) < 0: # Even the maximum rate falls short
+        return {"error": f"Goal of €{goal_balance:,.2f} unreachable with an annual interest rate up to {max_rate:.0f}%."}
 
-        if fv < goal_balance:
-            low_rate = mid_rate
-        else:
-            high_rate = mid_rate
-            
-    final_rate = high_rate # High_rate will be the first value to exceed goal
-    
-    if final_rate > Decimal('999'): # If it hits max rate, it might be unreachable
-        return {"error": f"Goal of €{goal_balance:,.2f} unreachable with an annual interest rate up to {float(high_rate):.0f}%."}
+    # Brent's method on the (monotonic) future value converges in a handful of evaluations
+    final_rate = brentq(log_shortfall, 0.0, max_rate, xtol=1e-10)
 
     # Generate history for the chart based on the calculated interest rate
-    history = _generate_compound_history(principal, final_rate, years, periods_per_year, periodic_deposit, deposit_at_beginning)
-
-    chart_data = {
-        'labels': [h['year'] for h in history],
-        'datasets': [
-            {
-                'label': 'Initial Principal',
-                'data': [float(h['principal_component']) for h in history],
-                'backgroundColor': 'rgba(59, 130, 246, 0.7)', # Blue
-                'borderColor': 'rgba(59, 130, 246, 1)',
-                'borderWidth': 1
-            },
-            {
-                'label': 'Total Deposits',
-                'data': [float(h['total_deposits_component']) for h in history],
-                'backgroundColor': 'rgba(16, 185, 129, 0.7)', # Green
-                'borderColor': 'rgba(16, 185, 129, 1)',
-                'borderWidth': 1
-            },
-            {
-                'label': 'Interest Earned',
-                'data': [float(h['interest_earned_component']) for h in history],
-                'backgroundColor': 'rgba(245, 158, 11, 0.7)', # Amber
-                'borderColor': 'rgba(245, 158, 11, 1)',
-                'borderWidth': 1
-            }
-        ]
-    }
+    chart_data = None
+    if generate_chart:
+        history = _generate_compound_history(principal, final_rate, years, periods_per_year, periodic_deposit, deposit_at_beginning)
+        chart_data = _build_chart_data(history)
 
     return {
         "interest_rate": final_rate,
-        "final_balance": calculate_future_value(principal, final_rate, years, periods_per_year, periodic_deposit, deposit_at_beginning),
+        "final_balance": goal_balance, # The solved rate reaches the goal (to brentq's tolerance), by construction
         "chart_data": chart_data,
         "calculated_field": "interest_rate"
     }
 
 
-def calculate_initial_balance_needed(annual_rate, years, periods_per_year, periodic_deposit, deposit_at_beginning, goal_balance):
+def calculate_initial_balance_needed(annual_rate, years, periods_per_year, periodic_deposit, deposit_at_beginning, goal_balance, generate_chart=True):
     """
     Calculates the initial balance needed to reach a goal balance.
-    All inputs are expected to be Decimal.
+    Inputs may be Decimal or plain numbers; the arithmetic is done in float.
+    With generate_chart=False the chart history is skipped and chart_data is None.
     """
-    annual_rate = Decimal(annual_rate)
-    years_dec = Decimal(years)
-    periodic_deposit = Decimal(periodic_deposit)
-    periods_per_year_dec = Decimal(periods_per_year)
-    goal_balance = Decimal(goal_balance)
+    annual_rate = float(annual_rate)
+    years_f = float(years)
+    periodic_deposit = float(periodic_deposit)
+    periods_per_year_f = float(periods_per_year)
+    goal_balance = float(goal_balance)
 
-    if periodic_deposit < 0 or annual_rate < 0 or years_dec <= 0 or periods_per_year_dec <= 0 or goal_balance <= 0:
-        return {"error": "All numeric inputs must be positive or zero (except for frequency, which must be positive). Goal balance must be positive."}
+    error = _input_error(non_negative=(periodic_deposit, annual_rate), positive=(years_f, periods_per_year_f, goal_balance))
+    if error:
+        return error
 
-    rate_per_period = (annual_rate / Decimal('100')) / periods_per_year_dec
-    num_periods = years_dec * periods_per_year_dec
+    rate_per_period = (annual_rate / 100) / periods_per_year_f
+    num_periods = years_f * periods_per_year_f
+
+    # Same (1 + r)^n serves the deposit annuity and the principal discount below
+    compound_factor, annuity_factor = _growth_and_annuity_factor(rate_per_period, num_periods, deposit_at_beginning)
 
     # Calculate FV of periodic deposits
-    if rate_per_period > 0:
-        fv_deposits = periodic_deposit * (((Decimal('1') + rate_per_period) ** num_periods - Decimal('1')) / rate_per_period)
-        if deposit_at_beginning:
-            fv_deposits *= (Decimal('1') + rate_per_period)
-    else:
-        fv_deposits = periodic_deposit * num_periods
+    fv_deposits = periodic_deposit * annuity_factor
 
     # Future value needed from initial principal component
     required_fv_from_principal = goal_balance - fv_deposits
@@ -405,7 +410,6 @@ def calculate_initial_balance_needed(annual_rate, years, periods_per_year, perio
 
     # Calculate required initial principal (P)
     # FV_principal = P * (1 + r/n)^nt  => P = FV_principal / (1 + r/n)^nt
-    compound_factor = (Decimal('1') + rate_per_period) ** num_periods
     if compound_factor == 0: # Should not happen with positive rate/periods
          return {"error": "Cannot calculate required initial balance due to mathematical impossibility (compound factor is zero)."}
          
@@ -415,38 +419,14 @@ def calculate_initial_balance_needed(annual_rate, years, periods_per_year, perio
         return {"error": "Calculated initial principal is negative, which is not a valid financial scenario. Please check inputs, especially if your goal is too low relative to deposits."}
 
     # Generate history for the chart based on the calculated initial balance
-    history = _generate_compound_history(required_principal, annual_rate, years, periods_per_year, periodic_deposit, deposit_at_beginning)
-    
-    chart_data = {
-        'labels': [h['year'] for h in history],
-        'datasets': [
-            {
-                'label': 'Initial Principal',
-                'data': [float(h['principal_component']) for h in history],
-                'backgroundColor': 'rgba(59, 130, 246, 0.7)', # Blue
-                'borderColor': 'rgba(59, 130, 246, 1)',
-                'borderWidth': 1
-            },
-            {
-                'label': 'Total Deposits',
-                'data': [float(h['total_deposits_component']) for h in history],
-                'backgroundColor': 'rgba(16, 185, 129, 0.7)', # Green
-                'borderColor': 'rgba(16, 185, 129, 1)',
-                'borderWidth': 1
-            },
-            {
-                'label': 'Interest Earned',
-                'data': [float(h['interest_earned_component']) for h in history],
-                'backgroundColor': 'rgba(245, 158, 11, 0.7)', # Amber
-                'borderColor': 'rgba(245, 158, 11, 1)',
-                'borderWidth': 1
-            }
-        ]
-    }
+    chart_data = None
+    if generate_chart:
+        history = _generate_compound_history(required_principal, annual_rate, years, periods_per_year, periodic_deposit, deposit_at_beginning)
+        chart_data = _build_chart_data(history)
 
     return {
         "initial_balance": required_principal,
-        "final_balance": calculate_future_value(required_principal, annual_rate, years, periods_per_year, periodic_deposit, deposit_at_beginning),
+        "final_balance": goal_balance, # The solved value reaches the goal exactly, by construction
         "chart_data": chart_data,
         "calculated_field": "initial_balance"
     }
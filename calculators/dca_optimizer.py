@@ -1,17 +1,48 @@
-import math
-from decimal import Decimal
+import numpy as np
 
-def calculate_optimal_dca(total_capital, share_price, commission_fee, annualized_volatility, share_type='whole', commission_cap=Decimal('0.05')):
+# Quotients of decimal inputs such as 0.7 / 0.1 come out as 6.999... in binary floating point.
+# Counts nudge each quotient by this relative amount toward the integer they round to, which absorbs
+# that noise (~1e-16) without pulling a genuinely smaller quotient such as 2.9999999996 up to 3.
+_COUNT_TOLERANCE = 1e-12
+
+def _floor_count(quotient):
+    """Floor of a quotient, treating values a hair below an integer as that integer."""
+    return np.floor(quotient * (1 + _COUNT_TOLERANCE))
+
+def _ceil_count(quotient):
+    """Ceiling of a quotient, treating values a hair above an integer as that integer."""
+    return np.ceil(quotient * (1 - _COUNT_TOLERANCE))
+
+def _max_viable_trades(total_capital, share_price, commission_fee, commission_cap, share_type):
+    """
+    Largest number of trades that keeps total commissions within the cap while each trade's cash
+    (total_capital / n) exceeds the commission and, for whole shares, also covers one share.
+    These conditions only get easier as n shrinks, so the count has a closed form.
+    Inputs may be floats or NumPy arrays (broadcast together); the result may be zero or negative.
+    """
+    has_fee = commission_fee > 0
+    safe_fee = np.where(has_fee, commission_fee, 1.0) # Avoids dividing by zero where there is no fee
+
+    # Constraint 1: Total commissions should not exceed the user-defined cap.
+    n_commission_cap = np.where(has_fee, _floor_count(commission_cap * total_capital / safe_fee), np.inf)
+
+    if share_type == 'whole':
+        # Every trade must afford at least one share plus its commission
+        return np.minimum(_floor_count(total_capital / (share_price + commission_fee)), n_commission_cap)
+    # Fractional shares: each trade's cash must stay above the commission; 1000 trades when there is no fee
+    return np.where(has_fee, np.minimum(n_commission_cap, _ceil_count(total_capital / safe_fee) - 1), 1000)
+
+def calculate_optimal_dca(total_capital, share_price, commission_fee, annualized_volatility, share_type='whole', commission_cap=0.05):
     """
     Calculates the optimal number of trades and the price-drop trigger for a DCA strategy,
     respecting a user-defined commission cap.
     """
-    # Ensure all inputs are Decimal for precision
-    total_capital = Decimal(total_capital)
-    share_price = Decimal(share_price)
-    commission_fee = Decimal(commission_fee)
-    annualized_volatility = Decimal(annualized_volatility)
-    commission_cap = Decimal(commission_cap)
+    # Plain floats are plenty for amounts that are only ever displayed to the cent
+    total_capital = float(total_capital)
+    share_price = float(share_price)
+    commission_fee = float(commission_fee)
+    annualized_volatility = float(annualized_volatility)
+    commission_cap = float(commission_cap)
 
     if total_capital <= 0:
         return {"error": "Total Capital must be a positive number."}
@@ -19,47 +50,13 @@ def calculate_optimal_dca(total_capital, share_price, commission_fee, annualized
         return {"error": "Current Share Price must be a positive number."}
     if commission_fee < 0:
         return {"error": "Commission Fee per Trade cannot be negative."}
-    if not (Decimal('0') <= commission_cap <= Decimal('1')):
+    if not (0 <= commission_cap <= 1):
         return {"error": "Commission Cap must be between 0 (0%) and 1 (100%)."}
 
-    # Constraint 1: Total commissions should not exceed the user-defined cap.
-    if commission_fee > 0:
-        n_commission_cap = math.floor((commission_cap * total_capital) / commission_fee)
-    else:
-        n_commission_cap = float('inf') 
-
-    # Determine the maximum possible number of trades to start our search from.
-    if share_type == 'whole':
-        if (share_price + commission_fee) > 0:
-            max_possible_trades = math.floor(total_capital / (share_price + commission_fee))
-        else:
-            max_possible_trades = 0
-    else: # Fractional shares
-        if commission_fee > 0:
-            max_possible_trades = n_commission_cap if n_commission_cap != float('inf') else 1000
-        else:
-            max_possible_trades = 1000
+    # The trade count and trigger come from the batch optimizer, run on a single asset
+    batch = calculate_optimal_dca_batch(total_capital, share_price, commission_fee, annualized_volatility, share_type, commission_cap)
+    n_optimal = int(batch['optimal_trades'])
 
-    n_optimal = 0
-    # Iterate downwards to find the best number of trades
-    for n in range(int(max_possible_trades), 0, -1):
-        if n > n_commission_cap:
-            continue
-
-        cash_per_trade = total_capital / Decimal(n)
-        investable_cash_per_trade = cash_per_trade - commission_fee
-
-        if investable_cash_per_trade <= 0:
-            continue
-
-        if share_type == 'whole':
-            if investable_cash_per_trade >= share_price:
-                n_optimal = n
-                break 
-        else: # Fractional shares
-            n_optimal = n
-            break
-            
     if n_optimal == 0:
         if share_type == 'whole':
             return {"error": f"Investment not feasible. You cannot afford one whole share (€{share_price:,.2f}) plus commission (€{commission_fee:,.2f}) with your capital."}
@@ -67,15 +64,15 @@ def calculate_optimal_dca(total_capital, share_price, commission_fee, annualized
             return {"error": f"Investment not feasible. Your capital per trade would be less than the commission fee (€{commission_fee:,.2f})."}
 
     # --- Final Calculations based on n_optimal ---
-    investable_capital = total_capital - (Decimal(n_optimal) * commission_fee)
+    investable_capital = total_capital - (n_optimal * commission_fee)
     
     if investable_capital <= 0:
-        return {"error": f"Investment not feasible. Total commissions (€{Decimal(n_optimal) * commission_fee:,.2f}) would exceed your total capital."}
+        return {"error": f"Investment not feasible. Total commissions (€{n_optimal * commission_fee:,.2f}) would exceed your total capital."}
 
     total_shares_bought = investable_capital / share_price
 
     if share_type == 'whole':
-        total_shares_bought = Decimal(math.floor(total_shares_bought))
+        total_shares_bought = float(_floor_count(total_shares_bought))
         if n_optimal > 0:
             total_shares_bought = (total_shares_bought // n_optimal) * n_optimal
 
@@ -90,14 +87,9 @@ def calculate_optimal_dca(total_capital, share_price, commission_fee, annualized
     capital_leftover = total_capital - total_money_spent
     shares_per_trade = total_shares_bought / n_optimal if n_optimal > 0 else 0
 
-    if annualized_volatility < 0:
-        optimal_percentage_drop = Decimal('0')
-    else:
-        optimal_percentage_drop = annualized_volatility / Decimal(math.sqrt(n_optimal)) if n_optimal > 0 else Decimal('0')
-
     return {
-        "optimal_trades": int(n_optimal),
-        "trigger_percentage": optimal_percentage_drop,
+        "optimal_trades": n_optimal,
+        "trigger_percentage": float(batch['trigger_percentage']),
         "total_shares_bought": total_shares_bought,
         "share_type": share_type,
         "total_money_spent": total_money_spent,
@@ -106,4 +98,34 @@ def calculate_optimal_dca(total_capital, share_price, commission_fee, annualized
         "capital_leftover": capital_leftover,
         "shares_per_trade": shares_per_trade,
         "commission_cap": commission_cap # Pass this back for display purposes
-    }
\ No newline at end of file
+    }
+
+
+def calculate_optimal_dca_batch(total_capital, share_price, commission_fee, annualized_volatility, share_type='whole', commission_cap=0.05):
+    """
+    Optimal number of trades and price-drop trigger for many assets at once (e.g. a portfolio of tickers);
+    calculate_optimal_dca runs it on a single asset. Array inputs are broadcast together; infeasible
+    entries get 0 trades.
+    Returns a dict of NumPy arrays with the optimal number of trades and the price-drop trigger.
+    """
+    total_capital = np.asarray(total_capital, dtype=np.float64)
+    share_price = np.asarray(share_price, dtype=np.float64)
+    commission_fee = np.asarray(commission_fee, dtype=np.float64)
+    annualized_volatility = np.asarray(annualized_volatility, dtype=np.float64)
+    commission_cap = np.asarray(commission_cap, dtype=np.float64)
+
+    n_optimal = _max_viable_trades(total_capital, share_price, commission_fee, commission_cap, share_type)
+
+    valid = (total_capital > 0) & (share_price > 0) & (commission_fee >= 0) & (commission_cap >= 0) & (commission_cap <= 1)
+    n_optimal = np.where(valid, np.maximum(n_optimal, 0), 0).astype(np.int64)
+
+    trigger_percentage = np.where(
+        (n_optimal > 0) & (annualized_volatility >= 0),
+        annualized_volatility / np.sqrt(np.maximum(n_optimal, 1)),
+        0.0
+    )
+
+    return {
+        "optimal_trades": n_optimal,
+        "trigger_percentage": trigger_percentage
+    }
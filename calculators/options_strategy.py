@@ -1,41 +1,49 @@
 from decimal import Decimal, getcontext
 import math
 import numpy as np
-from scipy.stats import norm
 
 # Set precision for Decimal calculations
 getcontext().prec = 28
 
+# Decimal constants used by the pricing code, built once (at the precision above) instead of on every call
+_ZERO = Decimal('0')
+_ONE = Decimal('1')
+_TWO = Decimal('2')
+_HALF = Decimal('0.5')
+_HUNDRED = Decimal('100')
+_DAYS_PER_YEAR = Decimal('365')
+_SQRT2 = _TWO.sqrt()
+_SQRT_2PI = (_TWO * Decimal(math.pi)).sqrt()
+# Abramowitz-Stegun 7.1.26 coefficients a1..a5 and p for the erf approximation
+_ERF_COEFFICIENTS = (
+    Decimal('0.254829592'), Decimal('-0.284496736'), Decimal('1.421413741'),
+    Decimal('-1.453152027'), Decimal('1.061405429'), Decimal('0.3275911')
+)
+
 def _erf_decimal(x):
     """
     A Decimal-compatible implementation of the error function (erf).
     """
-    a1 = Decimal('0.254829592')
-    a2 = Decimal('-0.284496736')
-    a3 = Decimal('1.421413741')
-    a4 = Decimal('-1.453152027')
-    a5 = Decimal('1.061405429')
-    p  = Decimal('0.3275911')
-    sign = Decimal('1')
+    a1, a2, a3, a4, a5, p = _ERF_COEFFICIENTS
+    sign = _ONE
     if x < 0:
-        sign = Decimal('-1')
+        sign = -_ONE
     x = abs(x)
-    t = Decimal('1.0') / (Decimal('1.0') + p * x)
-    y = Decimal('1.0') - (((((a5 * t + a4) * t) + a3) * t + a2) * t + a1) * t * (-x * x).exp()
+    t = _ONE / (_ONE + p * x)
+    y = _ONE - (((((a5 * t + a4) * t) + a3) * t + a2) * t + a1) * t * (-x * x).exp()
     return sign * y
 
 def _norm_cdf_decimal(x):
     """
     Decimal-compatible cumulative distribution function for the standard normal distribution.
     """
-    return Decimal('0.5') * (Decimal('1') + _erf_decimal(x / Decimal('2').sqrt()))
+    return _HALF * (_ONE + _erf_decimal(x / _SQRT2))
 
 def _norm_pdf_decimal(x):
     """
     Decimal-compatible probability density function for the standard normal distribution.
     """
-    pi = Decimal(math.pi)
-    return (-(x**2 / Decimal('2'))).exp() / (Decimal('2') * pi).sqrt()
+    return (-(x**2 / _TWO)).exp() / _SQRT_2PI
 
 def _approximate_american_greeks(s, k, t, r, sigma, option_type, steps=100):
     """
@@ -46,7 +54,7 @@ def _approximate_american_greeks(s, k, t, r, sigma, option_type, steps=100):
     # Small changes for bumping
     ds = s * Decimal('0.01')
     d_sigma = Decimal('0.01') # Corresponds to 1% change in volatility
-    dt = Decimal('1') 
+    dt = _ONE 
     dr = Decimal('0.01') # Corresponds to 1% change in risk-free rate
     
     # Initial price
@@ -65,7 +73,7 @@ def _approximate_american_greeks(s, k, t, r, sigma, option_type, steps=100):
         price_t_minus_1 = _binomial_tree_price_only(s, k, t - dt, r, sigma, option_type, steps)
         greeks['theta'] = (price_t_minus_1 - price)
     else:
-        greeks['theta'] = Decimal('0')
+        greeks['theta'] = _ZERO
 
 
     # Vega (per 1% change)
@@ -89,7 +97,7 @@ def calculate_expected_move(stock_price, call_price, put_price):
     if put_price < 0:
         return {"error": "ATM Put Option Price cannot be negative."}
     expected_move = call_price + put_price
-    expected_percentage = (expected_move / stock_price) if stock_price > 0 else Decimal('0')
+    expected_percentage = (expected_move / stock_price) if stock_price > 0 else _ZERO
     upper_bound = stock_price + expected_move
     lower_bound = stock_price - expected_move
     return {
@@ -125,13 +133,14 @@ def _calculate_pl_chart(s, k, price, option_type):
     """
     Generates the P/L chart data for an option, keeping calculations in Decimal.
     """
-    s, k, price = Decimal(s), Decimal(k), Decimal(price)
+    # The web layer already passes Decimals; only convert what isn't one
+    s, k, price = (v if isinstance(v, Decimal) else Decimal(v) for v in (s, k, price))
     price_range = [s * Decimal(f) for f in np.linspace(0.7, 1.3, 100)]
     
     if option_type == 'call':
-        profit_loss = [max(p - k, Decimal('0')) - price for p in price_range]
+        profit_loss = [max(p - k, _ZERO) - price for p in price_range]
     else: # put
-        profit_loss = [max(k - p, Decimal('0')) - price for p in price_range]
+        profit_loss = [max(k - p, _ZERO) - price for p in price_range]
     
     return {
         'labels': [float(p) for p in price_range], # Convert to float for Chart.js
@@ -145,26 +154,32 @@ def _binomial_tree_price_only(s, k, t, r, sigma, option_type, steps=100):
     Calculates the price of an American option using the Binomial Tree model without calculating greeks.
     This internal function is used to prevent recursion when calculating greeks.
     """
-    t_years = t / Decimal('365')
-    r_dec = r / Decimal('100')
-    sigma_dec = sigma / Decimal('100')
+    t_years = t / _DAYS_PER_YEAR
+    r_dec = r / _HUNDRED
+    sigma_dec = sigma / _HUNDRED
     
     dt = t_years / steps
     u = (sigma_dec * dt.sqrt()).exp()
-    d = Decimal('1') / u
+    d = _ONE / u
     p = ((r_dec * dt).exp() - d) / (u - d)
 
-    st = [s * (u ** (steps - i)) * (d ** i) for i in range(steps + 1)]
+    # Everything below is constant across the tree, so it is computed once rather than per node
+    q = _ONE - p
+    discount = (-r_dec * dt).exp()
+    u_powers = [u ** n for n in range(steps + 1)]
+    d_powers = [d ** n for n in range(steps + 1)]
+
+    st = [s * u_powers[steps - i] * d_powers[i] for i in range(steps + 1)]
 
     if option_type == 'call':
-        option_values = [max(price - k, Decimal('0')) for price in st]
+        option_values = [max(price - k, _ZERO) for price in st]
     else:
-        option_values = [max(k - price, Decimal('0')) for price in st]
+        option_values = [max(k - price, _ZERO) for price in st]
 
     for i in range(steps - 1, -1, -1):
         for j in range(i + 1):
-            option_values[j] = (p * option_values[j] + (Decimal('1') - p) * option_values[j + 1]) * (-r_dec * dt).exp()
-            st_price = s * (u ** (i - j)) * (d ** j)
+            option_values[j] = (p * option_values[j] + q * option_values[j + 1]) * discount
+            st_price = s * u_powers[i - j] * d_powers[j]
             if option_type == 'call':
                 option_values[j] = max(option_values[j], st_price - k)
             else:
@@ -201,27 +216,36 @@ def calculate_black_scholes(s, k, t, r, sigma, option_type, market_premium=None,
     if s <= 0 or k <= 0 or t <= 0 or r < 0 or sigma <= 0:
         return {'error': 'For European options, all inputs must be positive (except risk-free rate).'}
 
-    t_years = t / Decimal('365')
-    r_dec = r / Decimal('100')
-    sigma_dec = sigma / Decimal('100')
+    t_years = t / _DAYS_PER_YEAR
+    r_dec = r / _HUNDRED
+    sigma_dec = sigma / _HUNDRED
+    sqrt_t = t_years.sqrt()
+    discount = (-r_dec * t_years).exp()
 
-    d1 = ((s / k).ln() + (r_dec + Decimal('0.5') * sigma_dec ** 2) * t_years) / (sigma_dec * t_years.sqrt())
-    d2 = d1 - sigma_dec * t_years.sqrt()
+    d1 = ((s / k).ln() + (r_dec + _HALF * sigma_dec ** 2) * t_years) / (sigma_dec * sqrt_t)
+    d2 = d1 - sigma_dec * sqrt_t
+
+    # The Decimal CDF/PDF evaluations dominate the cost, and each one feeds several outputs,
+    # so every distinct value is computed once and shared by the price and the Greeks
+    pdf_d1 = _norm_pdf_decimal(d1)
 
     if option_type == 'call':
-        price = s * _norm_cdf_decimal(d1) - k * (-r_dec * t_years).exp() * _norm_cdf_decimal(d2)
-        delta = _norm_cdf_decimal(d1)
-        theta = -(s * _norm_pdf_decimal(d1) * sigma_dec) / (Decimal('2') * t_years.sqrt()) - r_dec * k * (-r_dec * t_years).exp() * _norm_cdf_decimal(d2)
+        cdf_d1 = _norm_cdf_decimal(d1)
+        cdf_d2 = _norm_cdf_decimal(d2)
+        price = s * cdf_d1 - k * discount * cdf_d2
+        delta = cdf_d1
+        theta = -(s * pdf_d1 * sigma_dec) / (_TWO * sqrt_t) - r_dec * k * discount * cdf_d2
     elif option_type == 'put':
-        price = k * (-r_dec * t_years).exp() * _norm_cdf_decimal(-d2) - s * _norm_cdf_decimal(-d1)
-        delta = _norm_cdf_decimal(d1) - Decimal('1')
-        theta = -(s * _norm_pdf_decimal(d1) * sigma_dec) / (Decimal('2') * t_years.sqrt()) + r_dec * k * (-r_dec * t_years).exp() * _norm_cdf_decimal(-d2)
+        cdf_minus_d2 = _norm_cdf_decimal(-d2)
+        price = k * discount * cdf_minus_d2 - s * _norm_cdf_decimal(-d1)
+        delta = _norm_cdf_decimal(d1) - _ONE
+        theta = -(s * pdf_d1 * sigma_dec) / (_TWO * sqrt_t) + r_dec * k * discount * cdf_minus_d2
     else:
         return {'error': 'Invalid option type selected.'}
 
-    gamma = _norm_pdf_decimal(d1) / (s * sigma_dec * t_years.sqrt())
-    vega = s * _norm_pdf_decimal(d1) * t_years.sqrt()
-    rho = k * t_years * (-r_dec * t_years).exp() * _norm_cdf_decimal(d2) if option_type == 'call' else -k * t_years * (-r_dec * t_years).exp() * _norm_cdf_decimal(-d2)
+    gamma = pdf_d1 / (s * sigma_dec * sqrt_t)
+    vega = s * pdf_d1 * sqrt_t
+    rho = k * t_years * discount * cdf_d2 if option_type == 'call' else -k * t_years * discount * cdf_minus_d2
 
     result = {
         'price': price,
@@ -245,7 +269,7 @@ def calculate_implied_volatility(s, k, t, r, market_premium, option_type, style=
     """
     MAX_ITERATIONS = 100
     PRECISION = Decimal('1.0e-5')
-    sigma = Decimal('0.5')  # Initial guess
+    sigma = _HALF  # Initial guess
 
     for i in range(MAX_ITERATIONS):
         price_result = calculate_black_scholes(s, k, t, r, sigma * 100, option_type, style=style)
@@ -336,11 +360,14 @@ def calculate_advanced_breakeven(inputs):
     
     max_days = int(inputs['days_to_hold']) + 20
     days_range = np.arange(1, max_days + 1)
-    percent_moves_np = [((_solve_for_move_plot(inputs['gamma'], inputs['delta'], (inputs['theta'] * d) + total_vega_impact - inputs['bid_ask_spread'], inputs['option_type']) or np.nan) / inputs['current_stock_price']) * 100 for d in days_range]
-    percent_moves = [None if np.isnan(p) else float(p) for p in percent_moves_np]
+    # Only the theta term of the headwind changes from day to day, so every day is solved in one pass
+    daily_headwinds = inputs['theta'] * days_range + total_vega_impact - inputs['bid_ask_spread']
+    moves = _solve_for_move_plot_vec(inputs['gamma'], inputs['delta'], daily_headwinds, inputs['option_type'])
+    moves[moves == 0] = np.nan # A zero move has always been left out of the chart, like an unsolvable day
+    percent_moves = [None if math.isnan(p) else p for p in (moves / inputs['current_stock_price'] * 100).tolist()]
 
     results['chart_data'] = {
-        'labels': [int(d) for d in days_range],
+        'labels': days_range.tolist(),
         'datasets': [{'label': 'Required % Move to Breakeven', 'data': percent_moves, 'borderColor': 'rgba(79, 70, 229, 1)', 'backgroundColor': 'rgba(79, 70, 229, 0.2)', 'fill': True, 'tension': 0.4 }]
     }
     return results
@@ -362,6 +389,24 @@ def _solve_for_move_plot(gamma, delta, total_headwind, option_type):
     else:
         if move1 <= 0 and move2 <= 0: return max(move1, move2)
         return move2 if move2 <= 0 else move1
+
+def _solve_for_move_plot_vec(gamma, delta, total_headwinds, option_type):
+    """
+    Vectorized _solve_for_move_plot over an array of headwinds, with NaN wherever there is no solution.
+    """
+    a = 0.5 * gamma
+    b = delta
+    c = np.asarray(total_headwinds, dtype=np.float64)
+    if abs(a) < 1e-9: return -c / b if abs(b) > 1e-9 else np.full_like(c, np.nan)
+    discriminant = (b**2) - (4 * a * c)
+    sqrt_discriminant = np.sqrt(np.maximum(discriminant, 0))
+    move1 = (-b + sqrt_discriminant) / (2 * a)
+    move2 = (-b - sqrt_discriminant) / (2 * a)
+    if option_type == 'call':
+        move = np.where((move1 >= 0) & (move2 >= 0), np.minimum(move1, move2), np.where(move1 >= 0, move1, move2))
+    else:
+        move = np.where((move1 <= 0) & (move2 <= 0), np.maximum(move1, move2), np.where(move2 <= 0, move2, move1))
+    return np.where(discriminant < 0, np.nan, move)
     
 def calculate_probabilities(s, k, t, r, sigma, target_price, option_type):
     """
@@ -374,35 +419,35 @@ def calculate_probabilities(s, k, t, r, sigma, target_price, option_type):
     # 1. Probability of expiring In-The-Money (using Delta)
     bs_result = calculate_black_scholes(s, k, t, r, sigma, option_type)
     if 'error' in bs_result:
-        prob_itm = Decimal('0') # Default on error
+        prob_itm = _ZERO # Default on error
     else:
         delta = bs_result['greeks']['delta']
         if option_type == 'call':
             prob_itm = delta
         else: # put
-            prob_itm = Decimal('1') - abs(delta)
+            prob_itm = _ONE - abs(delta)
 
     # 2. Probability of Touching a Target Price
     # This uses a standard formula for the probability of a stock price hitting a
     # barrier (H) before expiration, assuming a risk-neutral drift.
-    t_years = t / Decimal('365')
-    r_dec = r / Decimal('100')
-    sigma_dec = sigma / Decimal('100')
+    t_years = t / _DAYS_PER_YEAR
+    r_dec = r / _HUNDRED
+    sigma_dec = sigma / _HUNDRED
     
     # Risk-neutral drift
-    mu = r_dec - Decimal('0.5') * sigma_dec**2
+    mu = r_dec - _HALF * sigma_dec**2
     
     # Check if target is above or below current price to determine barrier type
     if target_price >= s: # Upper barrier (H)
         d1 = (-(s / target_price).ln() - mu * t_years) / (sigma_dec * t_years.sqrt())
         d2 = (-(s / target_price).ln() + mu * t_years) / (sigma_dec * t_years.sqrt())
         # --- FIX IS HERE ---
-        prob_touch = _norm_cdf_decimal(-d1) + (s / target_price)**(Decimal('2') * mu / (sigma_dec**2)) * _norm_cdf_decimal(d2)
+        prob_touch = _norm_cdf_decimal(-d1) + (s / target_price)**(_TWO * mu / (sigma_dec**2)) * _norm_cdf_decimal(d2)
     else: # Lower barrier (L)
         d1 = ((s / target_price).ln() + mu * t_years) / (sigma_dec * t_years.sqrt())
         d2 = ((s / target_price).ln() - mu * t_years) / (sigma_dec * t_years.sqrt())
         # --- FIX IS HERE ---
-        prob_touch = _norm_cdf_decimal(d1) + (s / target_price)**(Decimal('2') * mu / (sigma_dec**2)) * _norm_cdf_decimal(-d2)
+        prob_touch = _norm_cdf_decimal(d1) + (s / target_price)**(_TWO * mu / (sigma_dec**2)) * _norm_cdf_decimal(-d2)
 
     return {
         "prob_itm": prob_itm,
@@ -1,7 +1,32 @@
 # calculators/web_calculators.py
+import copy
 from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+import re
+from types import MappingProxyType
 from . import capital_gains, compound_interest, dca_optimizer, options_strategy
 
+# Input validation for numeric fields: plain decimal or scientific notation only, so the 'NaN'/'Infinity'
+# spellings Decimal() would accept are rejected. The match adds a little work per field rather than saving any.
+_NUMBER_RE = re.compile(r'[-+]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?')
+
+@lru_cache(maxsize=512)
+def _memoized_calculation(calculator, processed_items):
+    """
+    Runs a calculation for the given (sorted) processed inputs, as (name, value, spelling) triples.
+    The spelling is part of the key because Decimal('10') == Decimal('10.00'), yet Decimal results
+    keep the exponent of their inputs. Entries live as long as the process; the calculators are
+    pure functions of their inputs, so they never go stale.
+    """
+    return calculator.calculate({name: value for name, value, _ in processed_items})
+
+def _cached_calculation(calculator, processed_items):
+    """
+    Returns a deep copy of the memoized result, so a caller that modifies it cannot
+    change what later requests (possibly on other threads) get back for the same inputs.
+    """
+    return copy.deepcopy(_memoized_calculation(calculator, processed_items))
+
 class WebCalculator:
     """
     Base class for all web-based financial calculators.
@@ -14,6 +39,8 @@ class WebCalculator:
                 return default_value
             if isinstance(value, str):
                 value = value.strip().replace(',', '.')
+                if not _NUMBER_RE.fullmatch(value):
+                    return default_value
             return Decimal(value)
         except (InvalidOperation, TypeError):
             return default_value
@@ -27,26 +54,37 @@ class WebCalculator:
         except (ValueError, TypeError):
             return default_value
 
+    def _convert_fields(self, form_data, field_spec):
+        """
+        Converts the fields named in `field_spec` in a single pass.
+        `field_spec` maps each field name to its converter; invalid or missing values become None.
+        """
+        return {field: convert(self, form_data.get(field)) for field, convert in field_spec.items()}
+
     def _process_simple_form(self, form, field_definitions):
         """
         Generic processor for simple forms where all fields are required decimals.
         `field_definitions` is a list of field names.
         """
-        form_data = form.to_dict()
+        # The form is only read, so it is used as-is instead of being copied into a dict
+        form_data = form
         processed_data = {}
-        try:
-            for field in field_definitions:
-                value = self._safe_decimal_conversion(form_data.get(field))
-                if value is None:
-                    return None, form_data, {"error": "All fields must be filled with valid numbers."}
-                processed_data[field] = value
-            return processed_data, form_data, None
-        except Exception:
-            return None, form_data, {"error": "Invalid input. Please ensure all fields are filled correctly."}
+        for field in field_definitions:
+            value = self._safe_decimal_conversion(form_data.get(field))
+            if value is None:
+                return None, form_data, {"error": "All fields must be filled with valid numbers."}
+            processed_data[field] = value
+        return processed_data, form_data, None
+
+    # Default values for the form fields, built once when the subclass is defined.
+    # They are shared by every request, so subclasses wrap them in a read-only MappingProxyType.
+    DEFAULT_FORM_DATA = None
 
     def get_default_form_data(self):
         """Returns default values for the form fields."""
-        raise NotImplementedError("Subclasses must implement get_default_form_data")
+        if self.DEFAULT_FORM_DATA is None:
+            raise NotImplementedError("Subclasses must define DEFAULT_FORM_DATA")
+        return self.DEFAULT_FORM_DATA
 
     def process_form_data(self, form):
         """
@@ -62,20 +100,41 @@ class WebCalculator:
         """
         raise NotImplementedError("Subclasses must implement calculate")
 
+    # Whether the typed values from process_form_data replace the raw strings in the template's form data
+    MERGE_PROCESSED_DATA = False
+    # Whether results are memoized. Only worth it where recomputing costs more than copying a cached result.
+    CACHE_RESULTS = False
+
+    def process_and_calculate(self, form):
+        """
+        Processes the form and performs the calculation in a single call.
+        Returns a tuple: (result, form_data_for_template); the result is the error dictionary if the input is invalid.
+        """
+        processed_data, form_data, error = self.process_form_data(form)
+        if error:
+            return error, form_data
+
+        if self.CACHE_RESULTS:
+            result = _cached_calculation(self, tuple(sorted((name, value, str(value)) for name, value in processed_data.items())))
+        else:
+            result = self.calculate(processed_data)
+        if self.MERGE_PROCESSED_DATA:
+            form_data.update(processed_data)
+        return result, form_data
+
 class CompoundInterestWebCalculator(WebCalculator):
     """Handles logic for the Compound Interest Calculator."""
 
-    def get_default_form_data(self):
-        return {
-            'calculation_type': 'final_balance',
-            'initial_balance': 1000,
-            'periodic_deposit': 100,
-            'frequency': '12',
-            'deposit_timing': 'start',
-            'interest_rate': 7,
-            'duration': 10,
-            'target_balance': 20000
-        }
+    DEFAULT_FORM_DATA = MappingProxyType({
+        'calculation_type': 'final_balance',
+        'initial_balance': 1000,
+        'periodic_deposit': 100,
+        'frequency': '12',
+        'deposit_timing': 'start',
+        'interest_rate': 7,
+        'duration': 10,
+        'target_balance': 20000
+    })
 
     def _validate_compound_interest_inputs(self, data):
         """Performs validation based on the calculation type."""
@@ -110,25 +169,29 @@ class CompoundInterestWebCalculator(WebCalculator):
         
         return errors
 
+    # The results summary formats the submitted values as numbers
+    MERGE_PROCESSED_DATA = True
+
+    # Numeric form fields and the converter used for each
+    FIELD_SPEC = MappingProxyType({
+        'initial_balance': WebCalculator._safe_decimal_conversion,
+        'periodic_deposit': WebCalculator._safe_decimal_conversion,
+        'frequency': WebCalculator._safe_int_conversion,
+        'interest_rate': WebCalculator._safe_decimal_conversion,
+        'duration': WebCalculator._safe_int_conversion,
+        'target_balance': WebCalculator._safe_decimal_conversion
+    })
+
     def process_form_data(self, form):
         form_data = form.to_dict()
         calculation_type = form_data.get('calculation_type', 'final_balance')
-        
-        field_definitions = {
-            'initial_balance': 'decimal', 'periodic_deposit': 'decimal',
-            'frequency': 'int', 'interest_rate': 'decimal',
-            'duration': 'int', 'target_balance': 'decimal'
-        }
 
         processed_data = {'calculation_type': calculation_type}
-        for field, f_type in field_definitions.items():
-            raw_value = form_data.get(field)
-            if f_type == 'decimal':
-                processed_data[field] = self._safe_decimal_conversion(raw_value)
-            elif f_type == 'int':
-                processed_data[field] = self._safe_int_conversion(raw_value)
+        processed_data.update(self._convert_fields(form_data, self.FIELD_SPEC))
         
         processed_data['deposit_timing'] = form_data.get('deposit_timing') == 'start'
+        # The form's "Show growth chart" checkbox posts chart=0 when unticked, to get only the calculated value
+        processed_data['generate_chart'] = form_data.get('chart') != '0'
 
         errors = self._validate_compound_interest_inputs(processed_data)
         
@@ -179,87 +242,69 @@ class CompoundInterestWebCalculator(WebCalculator):
                     param_name = parameter_map[field]
                     calculation_args[param_name] = processed_data[field]
             
+            # The goal-seeking calculations can skip the chart; the final balance is read off the history itself
+            if calculation_type != 'final_balance':
+                calculation_args['generate_chart'] = processed_data.get('generate_chart', True)
+
             # Call the appropriate calculation function with the correctly named arguments
             result = calculation_map[calculation_type](**calculation_args)
+            if calculation_type == 'final_balance' and not processed_data.get('generate_chart', True):
+                result['chart_data'] = None
 
-            if 'error' in result or 'note' in result:
-                return result
-            
-            # Convert Decimal values in the result for JSON serialization
-            for key, value in result.items():
-                if isinstance(value, Decimal):
-                    result[key] = float(value)
-            
-            if 'chart_data' in result and result['chart_data']:
-                for dataset in result['chart_data']['datasets']:
-                    dataset['data'] = [float(val) if isinstance(val, Decimal) else val for val in dataset['data']]
-            
+            # The compound calculations work in float, so the result is ready for the template and JSON as-is
             return result
 
-        except Exception as e:
+        except (ArithmeticError, ValueError) as e: # Decimal overflow/invalid operations, math domain errors
             return {"error": f"An unexpected calculation error occurred: {e}. Please check your inputs."}
 
 
 class DCAOptimizerWebCalculator(WebCalculator):
     """Handles logic for the DCA Optimizer Calculator."""
 
-    def get_default_form_data(self):
-        return {
-            'total_capital': 1000,
-            'share_price': 10,
-            'commission_fee': 5,
-            'annualized_volatility': 0.60,
-            'share_type': 'whole',
-            'commission_cap': 0.05  # Default to 5%
-        }
+    DEFAULT_FORM_DATA = MappingProxyType({
+        'total_capital': 1000,
+        'share_price': 10,
+        'commission_fee': 5,
+        'annualized_volatility': 0.60,
+        'share_type': 'whole',
+        'commission_cap': 0.05  # Default to 5%
+    })
+
+    # Numeric form fields, all required decimals
+    FIELD_SPEC = MappingProxyType(dict.fromkeys(
+        ['total_capital', 'share_price', 'commission_fee', 'annualized_volatility', 'commission_cap'],
+        WebCalculator._safe_decimal_conversion
+    ))
 
     def process_form_data(self, form):
-        form_data = form.to_dict()
-        processed_data = {}
-        error = None
+        form_data = form # Read-only, so no dict copy is needed
+        # Process decimal fields
+        processed_data = self._convert_fields(form_data, self.FIELD_SPEC)
+        for field, value in processed_data.items():
+            if value is None:
+                # Provide a more specific error message
+                return None, form_data, {"error": f"A valid number for '{field.replace('_', ' ').title()}' is required."}
         
-        try:
-            # Process decimal fields
-            decimal_fields = ['total_capital', 'share_price', 'commission_fee', 'annualized_volatility', 'commission_cap']
-            for field in decimal_fields:
-                value = self._safe_decimal_conversion(form_data.get(field))
-                if value is None:
-                    # Provide a more specific error message
-                    return None, form_data, {"error": f"A valid number for '{field.replace('_', ' ').title()}' is required."}
-                processed_data[field] = value
-            
-            # Process the share_type string field
-            share_type = form_data.get('share_type', 'whole')
-            if share_type not in ['whole', 'fractional']:
-                share_type = 'whole' # Default to 'whole' if invalid value
-            processed_data['share_type'] = share_type
+        # Process the share_type string field
+        share_type = form_data.get('share_type', 'whole')
+        if share_type not in ['whole', 'fractional']:
+            share_type = 'whole' # Default to 'whole' if invalid value
+        processed_data['share_type'] = share_type
 
-        except Exception:
-            error = {"error": "Invalid input. Please ensure all fields are filled correctly."}
-
-        return processed_data, form_data, error
+        return processed_data, form_data, None
 
     def calculate(self, processed_data):
-        result = dca_optimizer.calculate_optimal_dca(**processed_data)
-        if 'error' in result:
-            return result
-        
-        # Convert all decimal values in the result dictionary to float for JSON compatibility
-        for key, value in result.items():
-            if isinstance(value, Decimal):
-                result[key] = float(value)
-        
-        return result
+        # The optimizer works in floats, so its result is already JSON-compatible
+        return dca_optimizer.calculate_optimal_dca(**processed_data)
 
 class CapitalGainsWebCalculator(WebCalculator):
     """Handles logic for the Capital Gains Opportunity Cost Calculator."""
 
-    def get_default_form_data(self):
-        return {
-            'current_value': 1500,
-            'cost_basis': 1000,
-            'tax_rate': 0.19
-        }
+    DEFAULT_FORM_DATA = MappingProxyType({
+        'current_value': 1500,
+        'cost_basis': 1000,
+        'tax_rate': 0.19
+    })
 
     def process_form_data(self, form):
         fields = ['current_value', 'cost_basis', 'tax_rate']
@@ -275,30 +320,29 @@ class CapitalGainsWebCalculator(WebCalculator):
             processed_data['cost_basis']
         )
         result['chart_data'] = chart_data
-        
-        for key in ['capital_gain', 'tax_cost', 'post_tax_proceeds', 'required_return']:
-            if key in result and isinstance(result[key], Decimal):
-                result[key] = float(result[key])
         return result
 
 
 class OptionsStrategyWebCalculator(WebCalculator):
     """Handles logic for the Options Strategy Calculator with enhanced validation."""
 
-    def get_default_form_data(self):
-        return {
-            'calculation_type': 'expected_move',
-            'stock_price_move': 150, 'call_price_move': 5, 'put_price_move': 5,
-            'stock_price_exercise': 165, 'strike_price_exercise': 155, 'premium_exercise': 10.50,
-            's_bs': 100, 'k_bs': 100, 't_bs': 90, 'r_bs': 5, 'sigma_bs': 20,
-            'option_type_bs': 'call', 'style_bs': 'european', 'market_premium_bs': 5.0,
-            's_iv': 100, 'k_iv': 100, 't_iv': 90, 'r_iv': 5, 'market_premium_iv': 5.0, 'option_type_iv': 'call',
-            'current_iv_rank': 35, 'iv_high_rank': 60, 'iv_low_rank': 20,
-            'current_stock_price_adv': 100, 'delta_adv': 0.5, 'gamma_adv': 0.08, 'theta_adv': -0.05,
-            'vega_adv': 0.12, 'bid_ask_spread_adv': 0.05, 'expected_iv_change_adv': -2,
-            'days_to_hold_adv': 10, 'option_type_adv': 'call',
-            's_prob': 100, 'k_prob': 105, 'target_price_prob': 110, 't_prob': 30, 'sigma_prob': 25, 'option_type_prob': 'call'
-        }
+    # The Decimal pricing models (binomial trees and the implied volatility search above all)
+    # take far longer than copying a cached result
+    CACHE_RESULTS = True
+
+    DEFAULT_FORM_DATA = MappingProxyType({
+        'calculation_type': 'expected_move',
+        'stock_price_move': 150, 'call_price_move': 5, 'put_price_move': 5,
+        'stock_price_exercise': 165, 'strike_price_exercise': 155, 'premium_exercise': 10.50,
+        's_bs': 100, 'k_bs': 100, 't_bs': 90, 'r_bs': 5, 'sigma_bs': 20,
+        'option_type_bs': 'call', 'style_bs': 'european', 'market_premium_bs': 5.0,
+        's_iv': 100, 'k_iv': 100, 't_iv': 90, 'r_iv': 5, 'market_premium_iv': 5.0, 'option_type_iv': 'call',
+        'current_iv_rank': 35, 'iv_high_rank': 60, 'iv_low_rank': 20,
+        'current_stock_price_adv': 100, 'delta_adv': 0.5, 'gamma_adv': 0.08, 'theta_adv': -0.05,
+        'vega_adv': 0.12, 'bid_ask_spread_adv': 0.05, 'expected_iv_change_adv': -2,
+        'days_to_hold_adv': 10, 'option_type_adv': 'call',
+        's_prob': 100, 'k_prob': 105, 'target_price_prob': 110, 't_prob': 30, 'sigma_prob': 25, 'option_type_prob': 'call'
+    })
     
     def _validate_options_inputs(self, data, calc_type):
         """Provides specific validation for each calculator type."""
@@ -322,47 +366,44 @@ class OptionsStrategyWebCalculator(WebCalculator):
         return error_messages
 
     def process_form_data(self, form):
-        form_data = form.to_dict()
+        form_data = form # Read-only, so no dict copy is needed
         calculation_type = form_data.get('calculation_type')
         processed_data = {'calculation_type': calculation_type}
         
-        try:
-            if calculation_type == 'expected_move':
-                fields_map = { 'stock_price': 'stock_price_move', 'call_price': 'call_price_move', 'put_price': 'put_price_move' }
-            elif calculation_type == 'sell_vs_exercise':
-                fields_map = { 'stock_price': 'stock_price_exercise', 'strike_price': 'strike_price_exercise', 'option_premium': 'premium_exercise' }
-            elif calculation_type == 'black_scholes':
-                fields_map = { 's': 's_bs', 'k': 'k_bs', 't': 't_bs', 'r': 'r_bs', 'sigma': 'sigma_bs', 'market_premium': 'market_premium_bs' }
-                processed_data['option_type'] = form_data.get('option_type_bs', 'call')
-                processed_data['style'] = form_data.get('style_bs', 'european')
-            elif calculation_type == 'implied_volatility':
-                 fields_map = { 's': 's_iv', 'k': 'k_iv', 't': 't_iv', 'r': 'r_iv', 'market_premium': 'market_premium_iv' }
-                 processed_data['option_type'] = form_data.get('option_type_iv', 'call')
-            elif calculation_type == 'iv_rank':
-                fields_map = { 'current_iv': 'current_iv_rank', 'iv_high': 'iv_high_rank', 'iv_low': 'iv_low_rank'}
-            elif calculation_type == 'advanced_breakeven':
-                fields_map = { 'current_stock_price': 'current_stock_price_adv', 'delta': 'delta_adv', 'gamma': 'gamma_adv', 'theta': 'theta_adv', 'vega': 'vega_adv', 'bid_ask_spread': 'bid_ask_spread_adv', 'expected_iv_change': 'expected_iv_change_adv', 'days_to_hold': 'days_to_hold_adv' }
-                processed_data['option_type'] = form_data.get('option_type_adv', 'call')
-            elif calculation_type == 'probability':
-                fields_map = { 's': 's_prob', 'k': 'k_prob', 'target_price': 'target_price_prob', 't': 't_prob', 'r': 'r_prob', 'sigma': 'sigma_prob' }
-                processed_data['option_type'] = form_data.get('option_type_prob', 'call')
-            else:
-                return None, form_data, {"error": "Invalid calculation type selected."}
-
-            for key, form_field in fields_map.items():
-                value = self._safe_decimal_conversion(form_data.get(form_field))
-                if value is None:
-                    if key != 'market_premium':
-                        return None, form_data, {"error": f"Please provide a valid number for {form_field.replace('_', ' ')}."}
-                processed_data[key] = value
-            
-            errors = self._validate_options_inputs(processed_data, calculation_type)
-            if errors:
-                return None, form_data, {"error": " ".join(errors)}
-            
-            return processed_data, form_data, None
-        except Exception:
-            return None, form_data, {"error": "An unexpected error occurred while processing inputs."}
+        if calculation_type == 'expected_move':
+            fields_map = { 'stock_price': 'stock_price_move', 'call_price': 'call_price_move', 'put_price': 'put_price_move' }
+        elif calculation_type == 'sell_vs_exercise':
+            fields_map = { 'stock_price': 'stock_price_exercise', 'strike_price': 'strike_price_exercise', 'option_premium': 'premium_exercise' }
+        elif calculation_type == 'black_scholes':
+            fields_map = { 's': 's_bs', 'k': 'k_bs', 't': 't_bs', 'r': 'r_bs', 'sigma': 'sigma_bs', 'market_premium': 'market_premium_bs' }
+            processed_data['option_type'] = form_data.get('option_type_bs', 'call')
+            processed_data['style'] = form_data.get('style_bs', 'european')
+        elif calculation_type == 'implied_volatility':
+             fields_map = { 's': 's_iv', 'k': 'k_iv', 't': 't_iv', 'r': 'r_iv', 'market_premium': 'market_premium_iv' }
+             processed_data['option_type'] = form_data.get('option_type_iv', 'call')
+        elif calculation_type == 'iv_rank':
+            fields_map = { 'current_iv': 'current_iv_rank', 'iv_high': 'iv_high_rank', 'iv_low': 'iv_low_rank'}
+        elif calculation_type == 'advanced_breakeven':
+            fields_map = { 'current_stock_price': 'current_stock_price_adv', 'delta': 'delta_adv', 'gamma': 'gamma_adv', 'theta': 'theta_adv', 'vega': 'vega_adv', 'bid_ask_spread': 'bid_ask_spread_adv', 'expected_iv_change': 'expected_iv_change_adv', 'days_to_hold': 'days_to_hold_adv' }
+            processed_data['option_type'] = form_data.get('option_type_adv', 'call')
+        elif calculation_type == 'probability':
+            fields_map = { 's': 's_prob', 'k': 'k_prob', 'target_price': 'target_price_prob', 't': 't_prob', 'r': 'r_prob', 'sigma': 'sigma_prob' }
+            processed_data['option_type'] = form_data.get('option_type_prob', 'call')
+        else:
+            return None, form_data, {"error": "Invalid calculation type selected."}
+
+        for key, form_field in fields_map.items():
+            value = self._safe_decimal_conversion(form_data.get(form_field))
+            if value is None:
+                if key != 'market_premium':
+                    return None, form_data, {"error": f"Please provide a valid number for {form_field.replace('_', ' ')}."}
+            processed_data[key] = value
+        
+        errors = self._validate_options_inputs(processed_data, calculation_type)
+        if errors:
+            return None, form_data, {"error": " ".join(errors)}
+        
+        return processed_data, form_data, None
 
     def calculate(self, processed_data):
         calculation_type = processed_data.pop('calculation_type')
@@ -0,0 +1,29 @@
+import unittest
+
+from app import app
+
+
+class CompoundOverflowRequestTest(unittest.TestCase):
+    """A balance too large for a float is shown as an error on the page, not as a 500 or 'inf'."""
+
+    def test_overflowing_final_balance_renders_the_error(self):
+        response = app.test_client().post('/compound', data={
+            'calculation_type': 'final_balance',
+            'initial_balance': '1000',
+            'periodic_deposit': '100',
+            'frequency': '12',
+            'deposit_timing': 'end',
+            'interest_rate': '1000',
+            'duration': '200',
+            'target_balance': '20000',
+        })
+        page = response.get_data(as_text=True)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("An unexpected calculation error occurred: math range error. Please check your inputs.", page)
+        self.assertNotIn('€inf', page)
+        self.assertNotIn('Infinity', page)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+
+from werkzeug.datastructures import MultiDict
+
+from calculators import compound_interest
+from calculators.web_calculators import CompoundInterestWebCalculator
+
+
+class FinalBalanceOverflowTest(unittest.TestCase):
+    """Balances too large for a float must be reported as an error, not rendered as inf."""
+
+    def test_history_overflow_raises(self):
+        with self.assertRaises(OverflowError):
+            compound_interest.calculate_final_balance_and_history(1000, 1e6, 1000, 12, 100, False)
+
+    def test_web_calculator_reports_overflow_like_the_scalar_path(self):
+        form = MultiDict({
+            'calculation_type': 'final_balance',
+            'initial_balance': '1000',
+            'periodic_deposit': '100',
+            'frequency': '12',
+            'deposit_timing': 'end',
+            'interest_rate': '1000000',
+            'duration': '1000',
+            'target_balance': '20000',
+        })
+        result, _ = CompoundInterestWebCalculator().process_and_calculate(form)
+        self.assertEqual(result, {"error": "An unexpected calculation error occurred: math range error. Please check your inputs."})
+
+
+class FinalBalanceValidationTest(unittest.TestCase):
+    """The final balance calculation reports which field is invalid."""
+
+    def test_each_invalid_field_gets_its_own_message(self):
+        cases = [
+            ((-1, 7, 10, 12, 100), "Initial Balance must be zero or positive."),
+            ((1000, -7, 10, 12, 100), "Annual Interest Rate must be zero or positive."),
+            ((1000, 7, 0, 12, 100), "Duration (Years) must be a positive integer."),
+            ((1000, 7, 10, 0, 100), "Deposit Frequency must be at least once a year."),
+            ((1000, 7, 10, 12, -100), "Periodic Deposit must be zero or positive."),
+        ]
+        for args, message in cases:
+            with self.subTest(args=args):
+                result = compound_interest.calculate_final_balance_and_history(*args, False)
+                self.assertEqual(result, {"error": message})
+
+    def test_first_invalid_field_wins(self):
+        result = compound_interest.calculate_final_balance_and_history(1000, 7, 0, 0, 100, False)
+        self.assertEqual(result, {"error": "Duration (Years) must be a positive integer."})
+
+    def test_goal_calculations_keep_the_shared_message(self):
+        result = compound_interest.calculate_time_to_reach_goal(1000, 7, 100, 12, False, goal_balance=-5)
+        self.assertEqual(result, {"error": compound_interest._GOAL_INPUT_ERROR})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import itertools
+import unittest
+
+import numpy as np
+
+from calculators import dca_optimizer
+
+
+class DecimalBoundaryTest(unittest.TestCase):
+    """Quotients on an integer must not lose a trade or a share to float noise, nor gain one just beside it."""
+
+    def test_whole_shares_at_an_exact_boundary(self):
+        # 0.7 / 0.1 is 6.999... in floating point, but 7 shares fit exactly
+        result = dca_optimizer.calculate_optimal_dca(1, 0.1, 0.3, 0.6, 'whole', 0.5)
+        self.assertEqual(result['optimal_trades'], 1)
+        self.assertEqual(result['total_shares_bought'], 7)
+
+    def test_whole_share_trade_count_at_an_exact_boundary(self):
+        # 0.3 / (0.05 + 0.05) is 2.999... in floating point, but three trades are affordable
+        result = dca_optimizer.calculate_optimal_dca(0.3, 0.05, 0.05, 0.6, 'whole', 1)
+        self.assertEqual(result['optimal_trades'], 3)
+        self.assertEqual(result['total_shares_bought'], 3)
+
+    def test_whole_shares_without_fee_at_an_exact_boundary(self):
+        result = dca_optimizer.calculate_optimal_dca(0.7, 0.1, 0, 0.6, 'whole', 0.05)
+        self.assertEqual(result['optimal_trades'], 7)
+
+    def test_fractional_trade_count_at_an_exact_boundary(self):
+        # 0.07 / 0.01 is 7.000...1 in floating point; seven trades would leave nothing after commissions
+        result = dca_optimizer.calculate_optimal_dca(0.07, 1, 0.01, 0.6, 'fractional', 1)
+        self.assertEqual(result['optimal_trades'], 6)
+
+    def test_whole_trade_count_just_below_a_boundary(self):
+        # 2.9999999996 is genuinely short of a third share, so only two trades are affordable
+        result = dca_optimizer.calculate_optimal_dca(2.9999999996, 1, 0, 0.6, 'whole', 0.05)
+        self.assertEqual(result['optimal_trades'], 2)
+        self.assertEqual(result['total_shares_bought'], 2)
+
+    def test_fractional_trade_count_just_above_a_boundary(self):
+        # 0.070000000004 / 0.01 is genuinely above 7, so seven trades still leave cash to invest
+        result = dca_optimizer.calculate_optimal_dca(0.070000000004, 1, 0.01, 0.6, 'fractional', 1)
+        self.assertEqual(result['optimal_trades'], 7)
+
+    def test_batch_agrees_at_the_boundaries(self):
+        batch = dca_optimizer.calculate_optimal_dca_batch([1, 0.3, 0.7], [0.1, 0.05, 0.1], [0.3, 0.05, 0], 0.6, 'whole', [0.5, 1, 0.05])
+        np.testing.assert_array_equal(batch['optimal_trades'], [1, 3, 7])
+        batch = dca_optimizer.calculate_optimal_dca_batch([0.07, 0.070000000004], 1, 0.01, 0.6, 'fractional', 1)
+        np.testing.assert_array_equal(batch['optimal_trades'], [6, 7])
+        batch = dca_optimizer.calculate_optimal_dca_batch(2.9999999996, 1, 0, 0.6, 'whole', 0.05)
+        self.assertEqual(batch['optimal_trades'], 2)
+
+
+class CalculateOptimalDcaBatchTest(unittest.TestCase):
+    """The batch optimizer must pick the same trade counts and triggers as the scalar one."""
+
+    CAPITALS = [1, 37, 100, 1000, 2500.5, 100000]
+    PRICES = [0.5, 3.33, 10, 99.99, 500]
+    FEES = [0, 0.5, 2.5, 9.99, 30]
+    CAPS = [0, 0.01, 0.05, 0.2, 1]
+
+    def assert_matches_scalar(self, share_type):
+        cases = list(itertools.product(self.CAPITALS, self.PRICES, self.FEES, self.CAPS))
+        capital, price, fee, cap = (np.array(column, dtype=float) for column in zip(*cases))
+
+        batch = dca_optimizer.calculate_optimal_dca_batch(capital, price, fee, 0.6, share_type, cap)
+
+        for i, case in enumerate(cases):
+            scalar = dca_optimizer.calculate_optimal_dca(*case[:3], 0.6, share_type, case[3])
+            with self.subTest(case=case):
+                if 'error' in scalar:
+                    self.assertEqual(batch['optimal_trades'][i], 0)
+                    self.assertEqual(batch['trigger_percentage'][i], 0.0)
+                else:
+                    self.assertEqual(batch['optimal_trades'][i], scalar['optimal_trades'])
+                    self.assertAlmostEqual(batch['trigger_percentage'][i], scalar['trigger_percentage'])
+
+    def test_whole_shares_match_scalar(self):
+        self.assert_matches_scalar('whole')
+
+    def test_fractional_shares_match_scalar(self):
+        self.assert_matches_scalar('fractional')
+
+    def test_invalid_inputs_get_zero_trades(self):
+        batch = dca_optimizer.calculate_optimal_dca_batch([-100, 1000, 1000, 1000], [10, 0, 10, 10], [5, 5, -1, 5], 0.6, 'whole', [0.05, 0.05, 0.05, 1.5])
+        np.testing.assert_array_equal(batch['optimal_trades'], [0, 0, 0, 0])
+        np.testing.assert_array_equal(batch['trigger_percentage'], [0.0, 0.0, 0.0, 0.0])
+
+    def test_scalar_inputs_broadcast(self):
+        batch = dca_optimizer.calculate_optimal_dca_batch(1000, [10, 20], 5, 0.6)
+        np.testing.assert_array_equal(batch['optimal_trades'], [10, 10])
+
+
+if __name__ == '__main__':
+    unittest.main()
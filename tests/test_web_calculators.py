@@ -0,0 +1,62 @@
+import unittest
+
+from werkzeug.datastructures import MultiDict
+
+from calculators.web_calculators import CompoundInterestWebCalculator, OptionsStrategyWebCalculator, _memoized_calculation
+
+
+class CachedCalculationTest(unittest.TestCase):
+    """Options results are served from a cache, which callers must not be able to corrupt."""
+
+    FORM = {
+        'calculation_type': 'black_scholes',
+        's_bs': '100',
+        'k_bs': '100',
+        't_bs': '30',
+        'r_bs': '5',
+        'sigma_bs': '25',
+        'option_type_bs': 'call',
+        'style_bs': 'european',
+    }
+
+    def setUp(self):
+        _memoized_calculation.cache_clear()
+
+    def test_mutating_a_result_does_not_affect_the_next_one(self):
+        calculator = OptionsStrategyWebCalculator()
+        first, _ = calculator.process_and_calculate(MultiDict(self.FORM))
+        expected_price = first['price']
+        expected_labels = list(first['pl_chart_data']['labels'])
+
+        first['price'] = -1
+        first['pl_chart_data']['labels'].append('tampered')
+
+        second, _ = calculator.process_and_calculate(MultiDict(self.FORM))
+        self.assertEqual(_memoized_calculation.cache_info().hits, 1)
+        self.assertIsNot(second, first)
+        self.assertEqual(second['price'], expected_price)
+        self.assertEqual(second['pl_chart_data']['labels'], expected_labels)
+
+    def test_equal_numbers_with_different_spellings_are_cached_separately(self):
+        calculator = OptionsStrategyWebCalculator()
+        calculator.process_and_calculate(MultiDict(self.FORM))
+        calculator.process_and_calculate(MultiDict(dict(self.FORM, s_bs='100.00')))
+        self.assertEqual(_memoized_calculation.cache_info().currsize, 2)
+
+    def test_cheap_calculators_are_not_cached(self):
+        form = MultiDict({
+            'calculation_type': 'final_balance',
+            'initial_balance': '1000',
+            'periodic_deposit': '100',
+            'frequency': '12',
+            'deposit_timing': 'end',
+            'interest_rate': '7',
+            'duration': '10',
+            'target_balance': '20000',
+        })
+        CompoundInterestWebCalculator().process_and_calculate(form)
+        self.assertEqual(_memoized_calculation.cache_info().currsize, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
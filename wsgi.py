@@ -0,0 +1,6 @@
+# wsgi.py
+# Entry point for production WSGI servers, e.g.:
+#   gunicorn -w 4 -k gthread --threads 8 --preload wsgi:application
+from app import app
+
+application = app